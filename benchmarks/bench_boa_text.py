@@ -0,0 +1,108 @@
+"""
+Microbenchmark da extração de campos do texto de um BOA.
+
+Compara a versão antiga (sete `re.search` sobre o texto inteiro, com os
+padrões recompilados a cada chamada, mais um `findall` para as matérias
+aprovadas) com a varredura única de `classes.ufrj.scan_boa_text`, em textos
+sintéticos do tamanho de BOAs reais (poucas páginas, dezenas de matérias).
+
+Uso:
+    python benchmarks/bench_boa_text.py
+    python benchmarks/bench_boa_text.py --periodos 4 8 12 --repeticoes 2000
+"""
+# 1. Bibliotecas padrão (Standard Library)
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# 2. Módulos da aplicação (Local application)
+from classes.ufrj import scan_boa_text
+
+
+def legacy_scan(full_text):
+    """
+    Implementação anterior de UFRJ.extract_student_data (referência de
+    comportamento, também usada por tests/test_boa_scan.py).
+    """
+    patterns = {
+        "nome_aluno": r"Emissão\n\s*([A-Z\s]+)",
+        "periodos_integralizados": r"Períodos Integralizados \(RES 10/2004 - CEG\):\s*([\d.]+)",
+        "prazo_maximo": r"Prazo máximo de integralização:\s*([\d.]+)",
+        "carga_horaria_obtida": r"Carga horária obtida acumulada:\s*([\d.]+)",
+        "creditos_obtidos": r"Créditos obtidos acumulados:\s*([\d.]+)",
+        "cr_acumulado": r"CR acumulado:\s*([\d.]+)",
+        "carga_horaria_extensao": r"Carga horária acumulada extensão:\s*([\d.]+)"
+    }
+
+    extracted_data = {}
+    for key, regex in patterns.items():
+        match = re.search(regex, full_text)
+        if match:
+            value = match.group(1).strip()
+            extracted_data[key] = value.title() if key == "nome_aluno" else float(value)
+        else:
+            extracted_data[key] = None
+
+    approved_pattern = re.compile(r"^([A-Z]{3}\d{3,})\s+.*?\s+[\d\.]+\s*$", re.MULTILINE)
+    approved = {code.upper() for code in approved_pattern.findall(full_text)}
+    extracted_data["approved_courses"] = sorted(approved - {"ICPZ55", "ICPX06"})
+    return extracted_data
+
+
+def make_boa_text(periods, courses_per_period=7, seed=0):
+    """
+    Gera um texto com a estrutura de um BOA extraído pelo pdfplumber.
+    """
+    rng = random.Random(seed)
+    prefixes = ["MAC", "MAE", "ICP", "FIM", "FIT", "IQG", "MAD", "ICPZ"]
+    lines = [
+        "UNIVERSIDADE FEDERAL DO RIO DE JANEIRO",
+        "Boletim de Orientação Acadêmica Data de Emissão",
+        "MARIA DA SILVA SOUZA",
+        "DRE: 120123456 Curso: Ciência da Computação",
+        f"Períodos Integralizados (RES 10/2004 - CEG): {periods}.0",
+        "Prazo máximo de integralização: 12.0",
+    ]
+    for period in range(1, periods + 1):
+        lines.append(f"Período {2018 + period // 2}/{period % 2 + 1}")
+        lines.append("Código Nome da Disciplina Créditos Situação Nota")
+        for _ in range(courses_per_period):
+            code = f"{rng.choice(prefixes)[:3]}{rng.randint(100, 999)}"
+            grade = f"{rng.uniform(0, 10):.1f}"
+            lines.append(f"{code} Disciplina Obrigatória de Exemplo {rng.randint(2, 6)}.0 AP {grade}")
+        lines.append("Coeficiente de Rendimento do Período: 7.8")
+    lines += [
+        "ICPZ55 Atividades Complementares 0.0 AP 0.0",
+        f"Carga horária obtida acumulada: {periods * 420}.0",
+        f"Créditos obtidos acumulados: {periods * 24}.0",
+        "CR acumulado: 7.9",
+        "Carga horária acumulada extensão: 120.0",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmark da extração de campos do BOA.")
+    parser.add_argument("--periodos", type=int, nargs="+", default=[4, 8, 12], help="Tamanhos de BOA (em períodos).")
+    parser.add_argument("--repeticoes", type=int, default=1000, help="Extrações por medida.")
+    args = parser.parse_args(argv)
+
+    print(f"{'períodos':>9} {'caracteres':>11} {'antigo (µs)':>12} {'novo (µs)':>10} {'ganho':>7}")
+    for periods in args.periodos:
+        text = make_boa_text(periods)
+        assert scan_boa_text(text) == legacy_scan(text), "As duas extrações divergiram"
+
+        legacy = min(timeit.repeat(lambda: legacy_scan(text), number=args.repeticoes, repeat=5))
+        single = min(timeit.repeat(lambda: scan_boa_text(text), number=args.repeticoes, repeat=5))
+        legacy_us = legacy / args.repeticoes * 1e6
+        single_us = single / args.repeticoes * 1e6
+        print(f"{periods:>9} {len(text):>11} {legacy_us:>12.1f} {single_us:>10.1f} {legacy_us / single_us:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,10 @@ from components import (
     render_sidebar,
     render_subject_uploader,
     report_card_compact,
-    load_data_from_url,
-    validate_spreadsheet_data
+    get_rule_refresher,
+    get_report_download
 )
 from core import find_equivalencies
-from data_loader import get_university_list
-from pdf_generator import create_pdf_bytes
 
 
 def main():
@@ -32,8 +30,10 @@ def main():
     )
 
     # --- Inicialização do Estado da Aplicação ---
-    if 'spreadsheet_data' not in st.session_state:
-        st.session_state.spreadsheet_data = None
+    # A sessão guarda apenas a versão das regras; os dados ficam no RuleStore
+    # compartilhado pelo processo inteiro.
+    if 'rule_version' not in st.session_state:
+        st.session_state.rule_version = None
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = []
 
@@ -42,44 +42,48 @@ def main():
     render_header(LOGO_PATH)
 
     # --- ETAPA 1: CARREGAMENTO E VALIDAÇÃO DOS DADOS (DA URL) ---
-    
-    # Só executa a carga e validação se os dados AINDA NÃO estiverem na sessão
-    if st.session_state.spreadsheet_data is None: 
-        with st.spinner("Carregando e validando planilha de equivalências..."):
-            
-            # 1. Tenta carregar os dados (da URL do .env)
-            load_error, data = load_data_from_url()
 
-            if load_error:
-                st.error(load_error)
-                st.stop()  # Para a execução do app se o carregamento falhar
-            
-            # 2. Tenta validar os dados (se o carregamento foi OK)
-            is_valid, validation_message = validate_spreadsheet_data(data)
+    # 1. Obtém o carregador de fundo (da URL do .env), que recarrega e
+    #    valida a planilha fora do caminho das requisições
+    config_error, refresher = get_rule_refresher()
+
+    if config_error:
+        st.error(config_error)
+        st.stop()  # Para a execução do app se a configuração estiver incompleta
+
+    # 2. Só a primeira carga do processo espera aqui; depois disso o
+    #    snapshot válido mais recente já está pronto no RuleStore
+    rules = refresher.store.current
+    if rules is None:
+        with st.spinner("Carregando e validando planilha de equivalências..."):
+            rules = refresher.wait_until_ready()
 
-            if not is_valid:
-                st.error(validation_message)
-                st.stop()  # Para a execução se a validação falhar
+    if rules is None:
+        st.error(refresher.last_error)
+        st.stop()  # Para a execução se a carga ou a validação falhar
 
-            # 3. Sucesso! Armazena os dados na sessão
-            st.session_state.spreadsheet_data = data
-            st.session_state.analysis_results = [] # Reseta os resultados
+    # 3. Todas as sessões passam juntas para a nova versão das regras;
+    #    resultados calculados com a versão anterior são descartados
+    if st.session_state.rule_version != rules.version:
+        if st.session_state.rule_version is not None:
+            st.toast("A planilha de equivalências foi atualizada.", icon="🔄")
+        st.session_state.rule_version = rules.version
+        st.session_state.analysis_results = [] # Reseta os resultados
 
     
     # --- ETAPA 2 e 3: SELEÇÃO DA UNIVERSIDADE E ENTRADA DOS CÓDIGOS ---
 
     # Ela só vai rodar se a 'ETAPA 1' for bem-sucedida.
-    if st.session_state.spreadsheet_data:
+    if rules.university_list:
         st.subheader("1. Selecione a Universidade e Insira os Códigos")
         
         col1, col2 = st.columns([1, 2])
         
         with col1:
             st.markdown("**Universidade de Origem**")
-            university_list = get_university_list(st.session_state.spreadsheet_data)
             selected_university = st.selectbox(
                 "Universidade de Origem",
-                options=university_list,
+                options=rules.university_list,
                 label_visibility="collapsed" 
             )
 
@@ -93,7 +97,7 @@ def main():
             if course_codes_input.strip():
                 with st.spinner("Buscando equivalências..."):
                     st.session_state.analysis_results = find_equivalencies(
-                        st.session_state.spreadsheet_data,
+                        rules.rule_indexes,
                         selected_university,
                         course_codes_input
                     )
@@ -113,10 +117,11 @@ def main():
             st.subheader("Gerar Relatório")
             st.success("Todas as disciplinas foram encontradas! Você já pode gerar o relatório.")
 
-            pdf_bytes = create_pdf_bytes(st.session_state.analysis_results, LOGO_PATH)
+            # Gerado uma vez por conjunto de resultados e reaproveitado nos reruns
+            report = get_report_download(st.session_state.analysis_results, LOGO_PATH)
             st.download_button(
                 label="Baixar Relatório em PDF",
-                data=pdf_bytes,
+                data=report.read(),
                 file_name="relatorio_equivalencia.pdf",
                 mime="application/pdf",
                 use_container_width=True
@@ -0,0 +1,233 @@
+"""
+Processamento em lote de BOAs (Boletins de Orientação Acadêmica) da UFRJ.
+
+Extrai os dados de vários PDFs em paralelo (um processo por núcleo) e
+grava os resultados em streaming, um registro por arquivo, em JSONL ou CSV.
+
+Uso:
+    python src/boa_batch.py data/boas/ -o resultados.jsonl
+    python src/boa_batch.py "data/boas/*.pdf" -o resultados.csv --workers 4 --resume
+"""
+# 1. Bibliotecas padrão (Standard Library)
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional
+
+# 2. Módulos da aplicação (Local application)
+from classes.ufrj import UFRJ
+from core import MP_CONTEXT
+
+# Colunas fixas do CSV (na ordem em que são gravadas)
+CSV_COLUMNS = [
+    "arquivo",
+    "status",
+    "erro",
+    "latencia_s",
+    "nome_aluno",
+    "periodos_integralizados",
+    "prazo_maximo",
+    "carga_horaria_obtida",
+    "creditos_obtidos",
+    "cr_acumulado",
+    "carga_horaria_extensao",
+    "approved_courses"
+]
+
+# Processador usado por cada processo do pool (criado no initializer)
+_PROCESSOR: Optional[UFRJ] = None
+
+
+def collect_pdf_paths(inputs: Iterable[str]) -> List[str]:
+    """
+    Expande diretórios e padrões glob em uma lista ordenada e sem repetições de PDFs.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True))
+        else:
+            paths.update(path for path in glob.glob(item, recursive=True) if path.lower().endswith(".pdf"))
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def load_done_files(output_path: str) -> set:
+    """
+    Lê uma saída anterior e devolve os arquivos já processados com sucesso
+    (arquivos que falharam são tentados de novo no --resume).
+    """
+    if not os.path.exists(output_path):
+        return set()
+
+    done = set()
+    with open(output_path, "r", encoding="utf-8", newline="") as f:
+        if output_path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            if row.get("status") == "ok":
+                done.add(row["arquivo"])
+    return done
+
+
+def _init_worker(equivalences_json_path: Optional[str]):
+    global _PROCESSOR
+    _PROCESSOR = UFRJ(equivalences_json_path)
+
+
+def _process_file(pdf_path: str) -> Dict[str, Any]:
+    """
+    Extrai um BOA e devolve o registro de saída. Nunca levanta exceção:
+    falhas viram registros com status "erro".
+    """
+    start = time.perf_counter()
+    try:
+        data = _PROCESSOR.extract_student_data(pdf_path)
+    except Exception as e:
+        data = {"error": f"Ocorreu um erro ao processar o PDF: {e}"}
+    latency = time.perf_counter() - start
+
+    record = {"arquivo": pdf_path, "latencia_s": round(latency, 4)}
+    if "error" in data:
+        record.update(status="erro", erro=data["error"])
+    else:
+        record.update(status="ok", erro=None, **data)
+    return record
+
+
+class _RecordWriter:
+    """
+    Grava registros em JSONL ou CSV à medida que chegam.
+
+    Com `append=True` (usado no --resume) os registros são acrescentados a uma
+    saída anterior; caso contrário o arquivo é recriado.
+    """
+
+    def __init__(self, output_path: str, append: bool = False):
+        self.is_csv = output_path.endswith(".csv")
+        is_new = not append or not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, "a" if append else "w", encoding="utf-8", newline="")
+
+        if self.is_csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            if is_new:
+                self._writer.writeheader()
+
+    def write(self, record: Dict[str, Any]):
+        if self.is_csv:
+            row = dict(record)
+            row["approved_courses"] = " ".join(record.get("approved_courses") or [])
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo (valores já ordenados).
+    """
+    if not sorted_values:
+        return 0.0
+    # Posto = ceil(p/100 * n), 1-based; a multiplicação vem antes da divisão
+    # para não arredondar 90 * 10 / 100 para 9.000000000000002
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(percent * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
+
+
+def run_batch(
+    pdf_paths: List[str],
+    output_path: str,
+    workers: Optional[int] = None,
+    equivalences_json_path: Optional[str] = None,
+    resume: bool = False
+) -> Dict[str, Any]:
+    """
+    Processa os BOAs em um pool de processos e grava cada resultado assim que fica pronto.
+
+    Args:
+        pdf_paths (List[str]): Os PDFs a processar.
+        output_path (str): Arquivo de saída (.jsonl ou .csv), recriado a cada execução.
+        workers (int | None): Número de processos (padrão: número de núcleos).
+        equivalences_json_path (str | None): JSON de equivalências repassado ao UFRJ.
+        resume (bool): Acrescenta à saída existente em vez de recriá-la.
+
+    Returns:
+        dict: Resumo com contagens, vazão (docs/s) e percentis de latência por arquivo.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = _RecordWriter(output_path, append=resume)
+    latencies = []
+    failures = 0
+    start = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=MP_CONTEXT,
+            initializer=_init_worker,
+            initargs=(equivalences_json_path,)
+        ) as executor:
+            futures = [executor.submit(_process_file, path) for path in pdf_paths]
+            for future in as_completed(futures):
+                record = future.result()
+                writer.write(record)
+                latencies.append(record["latencia_s"])
+                if record["status"] != "ok":
+                    failures += 1
+                    print(f"⚠️ {record['arquivo']}: {record['erro']}", file=sys.stderr)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "processados": len(latencies),
+        "falhas": failures,
+        "tempo_total_s": round(elapsed, 3),
+        "docs_por_s": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latencia_p50_s": _percentile(latencies, 50),
+        "latencia_p90_s": _percentile(latencies, 90),
+        "latencia_p99_s": _percentile(latencies, 99),
+        "latencia_max_s": latencies[-1] if latencies else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extrai dados de vários BOAs (PDF) em paralelo.")
+    parser.add_argument("inputs", nargs="+", help="Diretórios ou padrões glob com os PDFs dos BOAs.")
+    parser.add_argument("-o", "--output", required=True, help="Arquivo de saída (.jsonl ou .csv).")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Número de processos (padrão: núcleos).")
+    parser.add_argument("--resume", action="store_true", help="Pula arquivos já processados com sucesso na saída.")
+    parser.add_argument("--equivalencias", default=None, help="JSON de equivalências (opcional).")
+    args = parser.parse_args(argv)
+
+    pdf_paths = collect_pdf_paths(args.inputs)
+    if args.resume:
+        done = load_done_files(args.output)
+        pdf_paths = [path for path in pdf_paths if path not in done]
+        print(f"Retomando: {len(done)} arquivo(s) já processado(s).", file=sys.stderr)
+
+    if not pdf_paths:
+        print("Nenhum PDF para processar.", file=sys.stderr)
+        return 0
+
+    print(f"Processando {len(pdf_paths)} arquivo(s)...", file=sys.stderr)
+    summary = run_batch(pdf_paths, args.output, args.workers, args.equivalencias, resume=args.resume)
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+    return 1 if summary["falhas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,84 @@
 import json
 import re
-from typing import Set, Dict, Any, List
+from typing import Set, Dict, Any, List, Optional
+
+from pdf_document import open_pdf_document
+
+# --- Plano de extração do BOA (compilado uma única vez, no import) ---
+
+# Campos do cabeçalho, na ordem em que aparecem no resultado
+BOA_FIELDS = (
+    "nome_aluno",
+    "periodos_integralizados",
+    "prazo_maximo",
+    "carga_horaria_obtida",
+    "creditos_obtidos",
+    "cr_acumulado",
+    "carga_horaria_extensao"
+)
+
+# Todos os campos do cabeçalho em UMA regex com alternativas nomeadas. Toda
+# alternativa começa por um literal (o rótulo), o que deixa o motor de regex
+# pular direto para as posições candidatas; o nome do aluno fica em um
+# lookahead para não consumir as linhas seguintes.
+BOA_FIELDS_SCANNER = re.compile(
+    r"Emissão(?=\n\s*(?P<nome_aluno>[A-Z\s]+))"
+    r"|Períodos Integralizados \(RES 10/2004 - CEG\):\s*(?P<periodos_integralizados>[\d.]+)"
+    r"|Prazo máximo de integralização:\s*(?P<prazo_maximo>[\d.]+)"
+    r"|Carga horária obtida acumulada:\s*(?P<carga_horaria_obtida>[\d.]+)"
+    r"|Créditos obtidos acumulados:\s*(?P<creditos_obtidos>[\d.]+)"
+    r"|CR acumulado:\s*(?P<cr_acumulado>[\d.]+)"
+    r"|Carga horária acumulada extensão:\s*(?P<carga_horaria_extensao>[\d.]+)"
+)
+
+# Linhas de matérias aprovadas: um código, qualquer texto e uma nota numérica
+# no fim. Equivale ao padrão original "^(...)\s+.*?\s+[\d\.]+\s*$" (mesmos
+# códigos encontrados), mas o ".*" guloso evita o backtracking do ".*?".
+APPROVED_COURSE_PATTERN = re.compile(r"^([A-Z]{3}\d{3,})\s+.*\s+[\d.]+\s*$", re.MULTILINE)
+
+# Códigos que aparecem como linhas de matéria mas não devem ser contados
+EXCLUDED_COURSE_CODES = frozenset({"ICPZ55", "ICPX06"})
+
+
+def _convert_field(key: str, value: str) -> Any:
+    value = value.strip()
+    return value.title() if key == "nome_aluno" else float(value)
+
+
+def scan_boa_text(full_text: str) -> Dict[str, Any]:
+    """
+    Extrai os campos do cabeçalho e as matérias aprovadas do texto de um BOA.
+
+    São duas varreduras com regex pré-compiladas (uma para todos os campos,
+    outra para as matérias), no lugar das oito buscas da versão anterior, e
+    com o mesmo resultado. Para cada campo vale a primeira ocorrência no texto
+    (None se não houver); o nome do aluno vem em "Title Case" e os demais
+    campos como float.
+
+    Args:
+        full_text (str): Texto completo do BOA.
+
+    Returns:
+        Um dicionário com os campos de BOA_FIELDS e 'approved_courses'
+        (lista ordenada e sem repetições).
+    """
+    extracted_data: Dict[str, Any] = dict.fromkeys(BOA_FIELDS)
+
+    # 1. Campos do cabeçalho (uma varredura para todos os rótulos)
+    for match in BOA_FIELDS_SCANNER.finditer(full_text):
+        key = match.lastgroup
+        if extracted_data[key] is None:
+            extracted_data[key] = _convert_field(key, match.group(key))
+
+    # 2. Matérias aprovadas (varredura separada: uma linha de matéria nunca
+    #    "esconde" um rótulo de campo, e vice-versa)
+    approved_courses_set: Set[str] = {
+        code.upper() for code in APPROVED_COURSE_PATTERN.findall(full_text)
+    } - EXCLUDED_COURSE_CODES
+
+    extracted_data["approved_courses"] = sorted(approved_courses_set)
+    return extracted_data
 
-import pdfplumber
 
 # TODO: Implementar funcao de validacao do pdf (verificar se eh BOA)
 class UFRJ:
@@ -14,15 +90,17 @@ class UFRJ:
                              contendo as regras de equivalência de disciplinas.
     """
 
-    def __init__(self, equivalences_json_path: str):
+    def __init__(self, equivalences_json_path: Optional[str] = None):
         """
         Inicializa o processador da UFRJ.
 
         Args:
-            equivalences_json_path (str): O caminho para o arquivo JSON
-                                          contendo as regras de equivalência.
+            equivalences_json_path (str | None): O caminho para o arquivo JSON
+                                                 contendo as regras de equivalência.
+                                                 Se None, nenhuma regra é carregada
+                                                 (suficiente para extrair dados do BOA).
         """
-        self.equivalences = self._load_equivalences(equivalences_json_path)
+        self.equivalences = self._load_equivalences(equivalences_json_path) if equivalences_json_path else {}
 
     def _load_equivalences(self, json_path: str) -> Dict[str, Any]:
         """
@@ -46,7 +124,7 @@ class UFRJ:
             print(f"⚠️ Erro: O arquivo '{json_path}' não é um JSON válido.")
             return {}
 
-    def extract_student_data(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_student_data(self, pdf_path: Any) -> Dict[str, Any]:
         """
         Extrai todos os dados relevantes do aluno de um arquivo BOA (PDF).
 
@@ -54,63 +132,18 @@ class UFRJ:
         lista de todas as disciplinas aprovadas.
 
         Args:
-            pdf_path (str): O caminho para o arquivo PDF do BOA.
+            pdf_path: O caminho para o arquivo PDF do BOA (ou bytes, um objeto
+                      de arquivo ou um ParsedDocument já aberto).
 
         Returns:
             Um dicionário contendo os dados do aluno e a lista de matérias
             aprovadas. Retorna um dicionário de erro se o processamento falhar.
         """
         try:
-            full_text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + "\n"
-
-            # 1. Extrair dados acadêmicos (CR, Períodos, etc.)
-            patterns = {
-                "nome_aluno": r"Emissão\n\s*([A-Z\s]+)",
-                "periodos_integralizados": r"Períodos Integralizados \(RES 10/2004 - CEG\):\s*([\d.]+)",
-                "prazo_maximo": r"Prazo máximo de integralização:\s*([\d.]+)",
-                "carga_horaria_obtida": r"Carga horária obtida acumulada:\s*([\d.]+)",
-                "creditos_obtidos": r"Créditos obtidos acumulados:\s*([\d.]+)",
-                "cr_acumulado": r"CR acumulado:\s*([\d.]+)",
-                "carga_horaria_extensao": r"Carga horária acumulada extensão:\s*([\d.]+)"
-            }
+            with open_pdf_document(pdf_path) as document:
+                full_text = document.full_text()
 
-            extracted_data = {}
-            for key, regex in patterns.items():
-                match = re.search(regex, full_text)
-                if match:
-                    value = match.group(1).strip()
-                    if key == "nome_aluno":
-                        extracted_data[key] = value.title()
-                    else:
-                        extracted_data[key] = float(value)
-                else:
-                    extracted_data[key] = None # Usa None para indicar que não foi encontrado
-
-            # 2. Extrair todas as matérias aprovadas
-            approved_courses_set: Set[str] = set()
-            codes_to_exclude: Set[str] = {"ICPZ55", "ICPX06"}
-            
-            # Padrão para encontrar linhas que representam matérias aprovadas
-            # Procura por um código, seguido de qualquer texto, e terminando com uma nota numérica.
-            approved_pattern = re.compile(
-                r"^([A-Z]{3}\d{3,})\s+.*?\s+[\d\.]+\s*$",
-                re.MULTILINE
-            )
-
-            matches = approved_pattern.findall(full_text)
-            for course_code in matches:
-                if course_code.upper() not in codes_to_exclude:
-                    approved_courses_set.add(course_code.upper())
-            
-            # 3. Combinar todos os dados em um relatório final
-            extracted_data["approved_courses"] = sorted(list(approved_courses_set))
-
-            return extracted_data
+            return scan_boa_text(full_text)
 
         except Exception as e:
             return {"error": f"Ocorreu um erro ao processar o PDF: {e}"}
@@ -150,7 +183,7 @@ if __name__ == "__main__":
     #    (substitua 'data/boa.pdf' pelo caminho do seu arquivo)
     file_path = r"data/boa.pdf" 
     print(f"\n--- Analisando o arquivo: {file_path} ---")
-    student_data = ufrj_processor.extract_student_data_from_boa(file_path)
+    student_data = ufrj_processor.extract_student_data(file_path)
 
     # 5. Exibe o resultado da extração
     print("\n--- Dados Extraídos do Aluno ---")
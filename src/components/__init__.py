@@ -1,5 +1,6 @@
 from .sidebar import render_sidebar
 from .header import render_header
 from .report_card import report_card_compact
-from .spreadsheet_uploader import render_spreadsheet_uploader, load_data_from_url, validate_spreadsheet_data
-from .subjects_uploader import render_subject_uploader
\ No newline at end of file
+from .spreadsheet_uploader import render_spreadsheet_uploader, validate_spreadsheet_data, get_rule_refresher
+from .subjects_uploader import render_subject_uploader
+from .report_download import get_report_download
@@ -1,6 +1,8 @@
 import pandas as pd
 import streamlit as st
 
+from data_loader import is_equivalent_value
+
 
 def get_clean_value(value: any, placeholder: str = "Não preenchido") -> str:
     """
@@ -50,8 +52,7 @@ def report_card_compact(results: list) -> bool:
         for result in results:
             status = result.get("status")
             if status == "Encontrado":
-                is_equivalent_str = str(result.get("is_equivalent", "Não")).lower()
-                if is_equivalent_str in ['sim', 's', 'true', '1', 'verdadeiro']:
+                if is_equivalent_value(result.get("is_equivalent", "Não")):
                     equivalentes.append(result)
                 else:
                     nao_equivalentes.append(result)
@@ -0,0 +1,45 @@
+import threading
+from typing import BinaryIO, Optional
+
+import streamlit as st
+
+from pdf_generator import results_fingerprint, write_pdf
+
+# Quantos relatórios diferentes ficam guardados no processo
+REPORT_CACHE_ENTRIES = 32
+
+
+class ReportDownload:
+    """
+    Relatório já gerado, guardado em um arquivo temporário (memória ou disco).
+
+    Um único objeto é compartilhado por todos os reruns e sessões que pedem
+    o relatório dos mesmos resultados; a leitura é protegida por um lock
+    porque o arquivo tem uma única posição de leitura.
+    """
+
+    def __init__(self, report_file: BinaryIO):
+        self._file = report_file
+        self._lock = threading.Lock()
+
+    def read(self) -> bytes:
+        with self._lock:
+            self._file.seek(0)
+            return self._file.read()
+
+
+@st.cache_resource(max_entries=REPORT_CACHE_ENTRIES, show_spinner=False)
+def _get_report_download(results_key: str, _results: list, logo_path: Optional[str]) -> ReportDownload:
+    # `_results` não entra na chave do cache (o hash deles já está em results_key)
+    return ReportDownload(write_pdf(_results, logo_path))
+
+
+def get_report_download(results: list, logo_path: Optional[str]) -> ReportDownload:
+    """
+    Devolve o relatório em PDF dos resultados, gerando-o só na primeira vez.
+
+    A chave é o hash dos resultados: reruns do Streamlit (e outras sessões com
+    a mesma análise) reaproveitam o mesmo arquivo em vez de gerar e guardar
+    outra cópia do PDF.
+    """
+    return _get_report_download(results_fingerprint(results), results, logo_path)
@@ -1,10 +1,11 @@
 import os
-import pandas as pd
 from pandas import DataFrame
 from dotenv import load_dotenv
 import streamlit as st
-from typing import Tuple, Dict, Optional
-from data_loader import load_spreadsheet 
+from typing import Tuple, Optional
+from data_loader import load_spreadsheet
+from remote_workbook import RemoteWorkbook
+from rule_store import RuleRefresher, RuleStore
 
 
 REQUIRED_COLUMNS = {
@@ -109,50 +110,56 @@ def validate_spreadsheet_data(spreadsheet_data: dict[str, DataFrame]) -> tuple[b
     if is_valid:
         return True, "Validação bem-sucedida: Pelo menos uma aba válida foi encontrada."
     else:
+        missing_by_sheet = "; ".join(
+            f"'{sheet_name}' sem {', '.join(sorted(REQUIRED_COLUMNS - set(df.columns)))}"
+            for sheet_name, df in spreadsheet_data.items()
+        )
         error_message = (
             "Validação falhou! Nenhuma aba na planilha contém o conjunto completo "
-            f"de colunas obrigatórias: {', '.join(list(REQUIRED_COLUMNS))}"
+            f"de colunas obrigatórias: {', '.join(list(REQUIRED_COLUMNS))}. "
+            f"Colunas faltando: {missing_by_sheet}"
         )
         return False, error_message
 
 
-@st.cache_data(ttl=600) # Cache de 10 minutos
-def load_data_from_url() -> Tuple[Optional[str], Optional[Dict[str, DataFrame]]]:
+# Intervalo entre revalidações da planilha remota. Como a revalidação é
+# condicional (ETag/Last-Modified), um 304 não baixa nem re-parseia nada.
+REVALIDATE_SECONDS = 30
+
+
+@st.cache_resource
+def get_remote_workbook(sheet_url: str) -> RemoteWorkbook:
     """
-    Carrega uma planilha PÚBLICA (.xlsx) de uma URL do .env.
-    Lê TODAS as abas do arquivo Excel.
+    Retorna a instância (única por processo) que revalida a planilha remota.
+    """
+    return RemoteWorkbook(sheet_url)
+
+
+@st.cache_resource
+def get_rule_refresher() -> Tuple[Optional[str], Optional[RuleRefresher]]:
+    """
+    Inicia (uma vez por processo) a thread que recarrega a planilha da URL
+    do .env em segundo plano, validando cada nova versão antes de publicá-la
+    no RuleStore compartilhado por todas as sessões (`refresher.store`).
 
     Retorna:
-        Tuple[Optional[str], Optional[Dict[str, DataFrame]]]:
-        (error_message, data_dict)
-        - (None, data_dict) em caso de sucesso.
-        - (error_message, None) em caso de falha.
+        Tuple[Optional[str], Optional[RuleRefresher]]:
+        (error_message, refresher)
+        - (None, refresher) se a configuração estiver completa.
+        - (error_message, None) se 'PUBLIC_EXCEL_URL' não estiver definida.
     """
     load_dotenv()
-    
+
     sheet_url = os.getenv("PUBLIC_EXCEL_URL")
-    
+
     if not sheet_url:
         msg = "Configuração incompleta: 'PUBLIC_EXCEL_URL' não está definida no seu arquivo .env."
         return msg, None
 
-    try:
-        # sheet_name=None carrega todas as abas em um dicionário
-        spreadsheet_data = pd.read_excel(
-            sheet_url, 
-            sheet_name=None, 
-            engine='openpyxl' # Requer que 'openpyxl' esteja instalado
-        )
-        
-        if not spreadsheet_data:
-             return "Planilha carregada, mas está vazia (não contém abas).", None
-        
-        # Sucesso
-        return None, spreadsheet_data
-        
-    except Exception as e:
-        error_msg = (
-            f"Erro ao carregar a planilha da URL. Verifique o link no .env e se o "
-            f"arquivo é um .xlsx válido. (Erro: {e})"
-        )
-        return error_msg, None
+    refresher = RuleRefresher(
+        RuleStore(),
+        get_remote_workbook(sheet_url),
+        validator=validate_spreadsheet_data,
+        interval=REVALIDATE_SECONDS
+    )
+    return None, refresher.start()
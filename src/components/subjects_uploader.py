@@ -1,74 +1,325 @@
 import streamlit as st
 import pandas as pd
 import camelot
-import tempfile
 import os
 import re
-from typing import Any, List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from core import MP_CONTEXT
+from pdf_cache import PdfResultCache, content_hash
+from pdf_document import ParsedDocument
 
 # --- 1. Lógica de Backend ---
 
-def _scrape_pdf_content(uploaded_file: Any) -> List[pd.DataFrame]:
+# Regex dos códigos de disciplina: 3 Letras + 3 Números
+CODE_PATTERN = re.compile(r'[A-Z]{3}\d{3}')
+
+# Uma página só é considerada "de tabela" se tiver pelo menos esse número de códigos
+TABLE_PAGE_MIN_CODES = 2
+
+# Folga (em pontos) à esquerda do título de uma coluna para aceitar palavras nela
+COLUMN_TOLERANCE = 15
+
+# Parâmetros de tolerância do Camelot (script do seu colega)
+CAMELOT_OPTIONS = {
+    "flavor": "stream",
+    "strip_text": "\n",
+    "edge_tol": 500,
+    "row_tol": 15,
+    "column_tol": 10
+}
+
+
+def _group_lines(words: List[dict], tolerance: float = 3) -> List[List[dict]]:
+    """
+    Agrupa as palavras do pdfplumber em linhas visuais (mesmo 'top', com folga).
+    """
+    lines: List[List[dict]] = []
+    for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and abs(lines[-1][0]["top"] - word["top"]) <= tolerance:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    return lines
+
+
+def _fast_page_codes(words: List[dict]) -> Optional[List[str]]:
+    """
+    Extrai os códigos de origem de UMA página só com as posições das palavras.
+
+    Localiza o cabeçalho da tabela (linha com dois "CÓDIGO"), usa os códigos
+    UFRJ da 1ª coluna como âncoras de linha e pega, na coluna de código de
+    origem, o primeiro código de cada célula (mesma regra usada sobre o
+    resultado do Camelot).
+
+    Returns:
+        List[str] | None: Os códigos, ou None se a estrutura não for confiável
+                          (cabeçalho ausente, linha sem código de origem...).
+    """
+    header = None
+    for line in _group_lines(words):
+        titles = [w for w in line if w["text"] == "CÓDIGO"]
+        if len(titles) >= 2:
+            header = (line, titles)
+            break
+    if header is None:
+        return None
+
+    line, titles = header
+    header_bottom = max(w["bottom"] for w in line)
+    ufrj_code_x0, origin_code_x0 = titles[0]["x0"], titles[1]["x0"]
+    names = [w for w in line if w["text"] == "NOME"]
+    ufrj_name_x0 = next((w["x0"] for w in names if w["x0"] > ufrj_code_x0), None)
+    origin_name_x0 = next((w["x0"] for w in names if w["x0"] > origin_code_x0), None)
+    if ufrj_name_x0 is None or origin_name_x0 is None:
+        return None
+
+    body = [w for w in words if w["top"] > header_bottom]
+    anchors = sorted(
+        (w for w in body
+         if ufrj_code_x0 - COLUMN_TOLERANCE <= w["x0"] < ufrj_name_x0 and CODE_PATTERN.fullmatch(w["text"])),
+        key=lambda w: w["top"]
+    )
+    if not anchors:
+        return None
+
+    origin_words = [w for w in body if origin_code_x0 - COLUMN_TOLERANCE <= w["x0"] < origin_name_x0]
+
+    # Limites de cada linha: pontos médios entre âncoras consecutivas
+    bounds = [header_bottom]
+    for previous, current in zip(anchors, anchors[1:]):
+        bounds.append((previous["top"] + current["top"]) / 2)
+    bounds.append(anchors[-1]["top"] + (anchors[-1]["top"] - bounds[-1]))
+
+    codes = []
+    for low, high in zip(bounds, bounds[1:]):
+        cell_text = " ".join(
+            w["text"] for w in sorted(origin_words, key=lambda w: (w["top"], w["x0"]))
+            if low <= w["top"] < high
+        )
+        match = CODE_PATTERN.search(cell_text)
+        if not match:
+            return None
+        codes.append(match.group())
+
+    return codes
+
+
+def _text_layer_extract(document: ParsedDocument) -> tuple[List[int], Optional[List[str]]]:
+    """
+    Passada única e barata pela camada de texto (pdfplumber).
+
+    Descobre as páginas (1-based) que contêm a tabela de disciplinas e, para
+    elas, tenta extrair os códigos sem o Camelot.
+
+    Args:
+        document (ParsedDocument): O PDF já aberto (compartilhado com o Camelot).
+
+    Returns:
+        tuple[List[int], List[str] | None]: (páginas com tabela, códigos ou
+        None se a extração rápida não for confiável).
+    """
+    table_pages = []
+    codes: Optional[List[str]] = []
+    for page_number in range(1, document.page_count + 1):
+        words = document.page_words(page_number - 1)
+        code_count = sum(1 for w in words if CODE_PATTERN.search(w["text"]))
+        if code_count < TABLE_PAGE_MIN_CODES:
+            continue
+
+        table_pages.append(page_number)
+        if codes is not None:
+            page_codes = _fast_page_codes(words)
+            codes = codes + page_codes if page_codes is not None else None
+
+    if not table_pages:
+        codes = None
+    return table_pages, codes
+
+
+def _read_page_tables(pdf_path: str, pages: str) -> List[pd.DataFrame]:
+    """
+    Roda o Camelot nas páginas indicadas e devolve os DataFrames das tabelas.
+    """
+    tables = camelot.read_pdf(pdf_path, pages=pages, **CAMELOT_OPTIONS)
+    return [table.df for table in tables]
+
+
+@st.cache_resource
+def get_camelot_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Pool de processos do Camelot, único por processo do servidor e reaproveitado
+    entre uploads e sessões (None em máquinas com um só núcleo: lá as páginas
+    são lidas em sequência).
+
+    Os processos partem de um interpretador limpo (ver core.MP_CONTEXT).
+    """
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT)
+
+
+def _scrape_pdf_content(
+    document: ParsedDocument,
+    timings: Optional[Dict[str, float]] = None,
+    table_pages: Optional[List[int]] = None
+) -> List[pd.DataFrame]:
     """
-    Roda o Camelot e retorna a lista de DataFrames.
+    Roda o Camelot e retorna a lista de DataFrames das tabelas-alvo.
+
+    Primeiro uma sondagem pela camada de texto descobre quais páginas têm a
+    tabela; o Camelot (a etapa mais lenta) só roda nelas, com as páginas
+    distribuídas entre os processos de `get_camelot_pool` quando há mais de
+    uma. Se um processo do pool morrer, o pool é descartado (o próximo upload
+    cria outro) e as páginas são lidas em sequência. Se a sondagem não achar
+    nada, cai no comportamento antigo: todas as páginas, usando a 2ª tabela
+    do documento.
+
+    Args:
+        document (ParsedDocument): O PDF já aberto. O Camelot exige um caminho,
+                                que é materializado em tmpfs só aqui.
+        timings (dict | None): Se informado, recebe a duração (s) de cada etapa.
+        table_pages (List[int] | None): Páginas já sondadas; evita repetir a sondagem.
     """
     extracted_dfs = []
-    temp_path = None
+    if timings is None:
+        timings = {}
 
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tfile:
-            tfile.write(uploaded_file.getvalue())
-            temp_path = tfile.name
-
-        # Parâmetros de tolerância (script do seu colega)
-        tables = camelot.read_pdf(
-            temp_path, 
-            pages='all', 
-            flavor='stream',
-            strip_text='\n',
-            edge_tol=500,
-            row_tol=15,
-            column_tol=10
-        )
+        if table_pages is None:
+            start = time.perf_counter()
+            table_pages, _ = _text_layer_extract(document)
+            timings["sondagem"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pdf_path = document.as_path()
+        if not table_pages:
+            dfs = _read_page_tables(pdf_path, "all")
+            extracted_dfs = dfs[1:2]
+        else:
+            pool = get_camelot_pool() if len(table_pages) > 1 else None
+            pages = [str(page) for page in table_pages]
+            page_results = None
+            if pool is not None:
+                try:
+                    page_results = list(pool.map(_read_page_tables, [pdf_path] * len(pages), pages))
+                except BrokenProcessPool:
+                    # Um pool quebrado falharia em todos os uploads seguintes
+                    get_camelot_pool.clear()
+            if page_results is None:
+                page_results = map(_read_page_tables, [pdf_path] * len(pages), pages)
+            for page_dfs in page_results:
+                extracted_dfs.extend(page_dfs)
+        timings["camelot"] = time.perf_counter() - start
 
-        for table in tables:
-            extracted_dfs.append(table.df)
+        # Só tabelas com a coluna de códigos de origem (3ª coluna) interessam
+        extracted_dfs = [df for df in extracted_dfs if df.shape[1] > 2]
 
     except Exception as e:
         st.error(f"Erro no Camelot: {e}")
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
 
     return extracted_dfs
 
 def _extract_clean_codes(dfs: List[pd.DataFrame]) -> str:
     """
-    Pega a 2ª tabela e usa REGEX para manter APENAS códigos (Ex: MAE111).
+    Percorre as tabelas-alvo e usa REGEX para manter APENAS códigos (Ex: MAE111).
     Retorna os códigos separados por QUEBRA DE LINHA (\n).
     """
-    if not dfs or len(dfs) < 2:
+    if not dfs:
         return ""
 
-    # Foco na SEGUNDA tabela (índice 1)
-    target_df = dfs[1]
-    
-    # Pega todos os dados da terceira coluna como lista de strings
-    raw_data = target_df.iloc[:, 2].astype(str).tolist()
-    
     clean_codes = []
-    pattern = re.compile(r'[A-Z]{3}\d{3}') # Regex: 3 Letras + 3 Números
 
-    for item in raw_data:
-        match = pattern.search(item)
-        if match:
-            clean_codes.append(match.group())
-            
-        # matches = pattern.findall(item)
-        # clean_codes.extend(matches) # Adiciona todos que achou
-            
+    for target_df in dfs:
+        # Pega todos os dados da terceira coluna como lista de strings
+        raw_data = target_df.iloc[:, 2].astype(str).tolist()
+
+        for item in raw_data:
+            match = CODE_PATTERN.search(item)
+            if match:
+                clean_codes.append(match.group())
+
+            # matches = CODE_PATTERN.findall(item)
+            # clean_codes.extend(matches) # Adiciona todos que achou
+
     return "\n".join(clean_codes)
 
+
+def scrape_pdf_codes(uploaded_file: Any, cache: Optional[PdfResultCache] = None) -> tuple[str, Dict[str, float]]:
+    """
+    Executa o fluxo completo upload -> códigos, em camadas, e mede cada etapa.
+
+    0. Cache: se o mesmo PDF (mesmo SHA-256) já foi processado, devolve o
+       resultado guardado sem extrair nada.
+    1. Camada de texto (pdfplumber): sonda as páginas e tenta extrair os
+       códigos pela posição das palavras; resolve a maioria dos PDFs em bem
+       menos de um segundo.
+    2. Camelot: só é acionado quando a extração rápida não é confiável.
+
+    Args:
+        uploaded_file: O arquivo PDF carregado pelo Streamlit.
+        cache (PdfResultCache | None): Cache de resultados compartilhado.
+
+    Returns:
+        tuple[str, dict[str, float]]: (códigos separados por \n, duração de cada etapa em segundos)
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    pdf_bytes = uploaded_file.getvalue()
+
+    cache_key = None
+    if cache is not None:
+        cache_key = content_hash(pdf_bytes)
+        cached = cache.get(cache_key)
+        timings["cache"] = time.perf_counter() - start
+        if cached is not None:
+            timings["total"] = time.perf_counter() - start
+            return cached["codes"], timings
+
+    # O PDF é aberto uma única vez e compartilhado pelas duas camadas
+    with ParsedDocument(pdf_bytes) as document:
+        text_start = time.perf_counter()
+        try:
+            table_pages, fast_codes = _text_layer_extract(document)
+        except Exception:
+            table_pages, fast_codes = None, None
+        timings["texto"] = time.perf_counter() - text_start
+
+        if fast_codes:
+            clean_text, dfs = "\n".join(fast_codes), []
+        else:
+            dfs = _scrape_pdf_content(document, timings, table_pages)
+
+            extract_start = time.perf_counter()
+            clean_text = _extract_clean_codes(dfs)
+            timings["códigos"] = time.perf_counter() - extract_start
+
+    if cache is not None and clean_text:
+        cache.put(cache_key, {"codes": clean_text, "tables": dfs})
+
+    timings["total"] = time.perf_counter() - start
+    return clean_text, timings
+
+
+@st.cache_resource
+def get_pdf_cache() -> PdfResultCache:
+    """
+    Cache de PDFs processados, único por processo (compartilhado entre sessões).
+    Se 'PDF_CACHE_DIR' estiver definida no .env, as entradas também vão para o disco.
+    """
+    load_dotenv()
+    return PdfResultCache(cache_dir=os.getenv("PDF_CACHE_DIR") or None)
+
+
+def _format_timings(timings: Dict[str, float]) -> str:
+    return " · ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+
 # --- 2. O Componente de Interface ---
 
 def render_subject_uploader():
@@ -93,17 +344,20 @@ def render_subject_uploader():
         if "last_processed_id" not in st.session_state or st.session_state["last_processed_id"] != file_id:
             
             with st.spinner("Extraindo códigos..."):
-                dfs = _scrape_pdf_content(uploaded_file)
-                clean_text = _extract_clean_codes(dfs)
+                clean_text, timings = scrape_pdf_codes(uploaded_file, get_pdf_cache())
                 
                 if clean_text:
                     # Atualiza o widget text_area
                     st.session_state[WIDGET_KEY] = clean_text
                     st.toast("Códigos extraídos!", icon="✨")
                 else:
-                    st.warning("Nenhum código encontrado na 2ª tabela.")
+                    st.warning("Nenhum código encontrado na tabela de disciplinas.")
             
             st.session_state["last_processed_id"] = file_id
+            st.session_state["last_extraction_timings"] = timings
+
+        if st.session_state.get("last_extraction_timings"):
+            st.caption(f"⏱️ {_format_timings(st.session_state['last_extraction_timings'])}")
 
     # Widget de Texto
     final_input = st.text_area(
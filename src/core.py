@@ -1,67 +1,497 @@
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+from data_loader import REQUIRED_COLUMNS, is_equivalent_value
+
+
+# Contexto de todos os pools de processos do projeto. Os pools são criados
+# com outras threads ativas (Streamlit, estágios do pipeline, caches com
+# lock): "fork" nesse ponto pode herdar locks presos, então os processos
+# partem de um interpretador limpo
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _parse_rule_codes(origin_codes_str: str) -> frozenset[str]:
+    """
+    Quebra a regra "INF1+INF2" da planilha em um conjunto {"INF1", "INF2"}.
+    """
+    return frozenset(c.strip().upper() for c in origin_codes_str.split('+') if c.strip())
+
+
+def _parse_input_codes(course_codes_str: str) -> frozenset[str]:
+    """
+    Limpa a entrada do usuário: '+', ',' e quebras de linha viram separadores,
+    então "INF01+INF02" vira {"INF01", "INF02"}.
+    """
+    cleaned_str = course_codes_str.replace("+", " ").replace(",", " ").replace("\n", " ")
+    return frozenset(code.strip().upper() for code in cleaned_str.split() if code.strip())
+
+
+class Rule:
+    """
+    Registro compacto de uma regra de equivalência já compilada.
+    """
+
+    __slots__ = (
+        "origin_codes",
+        "origin_names",
+        "is_equivalent",
+        "dest_codes",
+        "dest_names",
+        "justification",
+    )
+
+    def __init__(self, origin_codes, origin_names, is_equivalent, dest_codes, dest_names, justification):
+        self.origin_codes = origin_codes
+        self.origin_names = origin_names
+        self.is_equivalent: bool = is_equivalent
+        self.dest_codes = dest_codes
+        self.dest_names = dest_names
+        self.justification = justification
+
+
+class RuleIndex:
+    """
+    Índice compilado das regras de equivalência de UMA universidade (aba).
+
+    É construído uma única vez quando a planilha é carregada e guarda:
+        - os conjuntos de códigos exigidos por cada regra, já parseados;
+        - os detalhes de cada regra (registros Rule, com 'Equivalente?' já
+          normalizado para bool), na ordem de prioridade (regras com o texto
+          de 'Códigos Origem' mais longo primeiro; empates na ordem da planilha);
+        - um índice invertido código -> posições das regras que o mencionam;
+        - só para o backend "bitset", e só na primeira consulta que o usa: o
+          vocabulário de códigos da aba internado em ids inteiros e, para
+          cada regra, uma linha de bitmask (NumPy uint64) com os seus códigos.
+
+    Assim, uma consulta só visita as regras que compartilham pelo menos um
+    código com a entrada do usuário, e o custo passa a depender do tamanho da
+    entrada e não do tamanho da aba. Alternativamente, o backend "bitset"
+    testa todas as regras de uma vez com uma única operação vetorizada.
+    """
+
+    __slots__ = ("required", "details", "by_code", "code_ids", "bitmasks")
+
+    def __init__(self, university_df: pd.DataFrame):
+        origin_codes = university_df["Códigos Origem"].astype(str).tolist()
+
+        # Prioridade: do maior para o menor texto de 'Códigos Origem'. O sort é
+        # estável, então regras de mesmo tamanho ficam na ordem da planilha. O
+        # sort_values(ascending=False) antigo do pandas (quicksort, não estável)
+        # desempatava em uma ordem arbitrária, então empates podem escolher
+        # outra regra do que a versão anterior escolhia
+        order = sorted(range(len(origin_codes)), key=lambda i: len(origin_codes[i]), reverse=True)
+
+        columns = [
+            university_df[name].tolist()
+            for name in (
+                "Códigos Origem",
+                "Nomes Origem",
+                "Equivalente?",
+                "Códigos UFRJ Destino",
+                "Nomes UFRJ Destino",
+                "Justificativa Parecer",
+            )
+        ]
+
+        self.required: list[frozenset[str]] = []
+        self.details: list[Rule] = []
+        self.by_code: dict[str, list[int]] = {}
+
+        for row in order:
+            required_codes = _parse_rule_codes(origin_codes[row])
+            if not required_codes:
+                continue
+
+            position = len(self.required)
+            self.required.append(required_codes)
+            origin, origin_names, is_equivalent, dest, dest_names, justification = (column[row] for column in columns)
+            self.details.append(Rule(
+                origin,
+                origin_names,
+                is_equivalent_value(is_equivalent),
+                dest,
+                dest_names,
+                justification
+            ))
+            for code in required_codes:
+                self.by_code.setdefault(code, []).append(position)
+
+        # Montados sob demanda por _build_bitmasks (só o backend "bitset" usa)
+        self.code_ids: dict[str, int] | None = None
+        self.bitmasks: np.ndarray | None = None
+
+    def _build_bitmasks(self):
+        """
+        Interna o vocabulário de códigos e empacota cada regra em uma linha de bits.
+
+        A matriz é montada inteira antes de ser publicada (o atributo só é
+        atribuído no fim), então consultas concorrentes nunca veem uma matriz
+        pela metade; no pior caso ela é montada duas vezes.
+        """
+        code_ids = {code: i for i, code in enumerate(sorted(self.by_code))}
+        n_words = max(1, -(-len(code_ids) // 64))
+
+        rows, ids = [], []
+        for position, required_codes in enumerate(self.required):
+            for code in required_codes:
+                rows.append(position)
+                ids.append(code_ids[code])
+
+        rows = np.asarray(rows, dtype=np.intp)
+        ids = np.asarray(ids, dtype=np.uint64)
+
+        bitmasks = np.zeros((len(self.required), n_words), dtype=np.uint64)
+        np.bitwise_or.at(
+            bitmasks,
+            (rows, (ids // np.uint64(64)).astype(np.intp)),
+            np.left_shift(np.uint64(1), ids % np.uint64(64))
+        )
+        self.code_ids = code_ids
+        self.bitmasks = bitmasks
+
+    def __len__(self) -> int:
+        return len(self.required)
+
+    def candidates(self, input_codes: frozenset[str]) -> list[int]:
+        """
+        Retorna, em ordem de prioridade, as posições das regras cujos códigos
+        exigidos estão TODOS contidos em `input_codes`.
+        """
+        touched = set()
+        for code in input_codes:
+            touched.update(self.by_code.get(code, ()))
+
+        return [pos for pos in sorted(touched) if self.required[pos] <= input_codes]
+
+    def candidates_bitset(self, input_codes: frozenset[str]) -> list[int]:
+        """
+        Mesmo contrato de `candidates`, mas testando TODAS as regras de uma vez
+        com `(regras & entrada) == regras` sobre a matriz de bitmasks (montada
+        na primeira chamada).
+        """
+        if self.bitmasks is None:
+            self._build_bitmasks()
+        bitmasks, code_ids = self.bitmasks, self.code_ids
+
+        input_mask = np.zeros(bitmasks.shape[1], dtype=np.uint64)
+        for code in input_codes:
+            code_id = code_ids.get(code)
+            if code_id is not None:
+                input_mask[code_id // 64] |= np.uint64(1) << np.uint64(code_id % 64)
+
+        matches = ((bitmasks & input_mask) == bitmasks).all(axis=1)
+        return np.flatnonzero(matches).tolist()
+
+    def result_details(self, position: int) -> dict:
+        """
+        Monta o dicionário de resultado ("Encontrado") para a regra na posição dada.
+        """
+        rule = self.details[position]
+        return {
+            "status": "Encontrado",
+            "origin_codes": rule.origin_codes,
+            "origin_names": rule.origin_names,
+            "is_equivalent": rule.is_equivalent,
+            "dest_codes": rule.dest_codes,
+            "dest_names": rule.dest_names,
+            "justification": rule.justification
+        }
+
+
+def compile_rule_indexes(spreadsheet_data: dict[str, pd.DataFrame]) -> dict[str, RuleIndex]:
+    """
+    Compila um RuleIndex para cada aba de universidade da planilha.
+
+    Abas que não possuem as colunas obrigatórias são ignoradas.
+
+    Args:
+        spreadsheet_data (dict[str, DataFrame]): O dicionário de abas carregado.
+
+    Returns:
+        dict[str, RuleIndex]: Índices compilados, por nome da universidade.
+    """
+    return {
+        sheet_name: RuleIndex(df)
+        for sheet_name, df in spreadsheet_data.items()
+        if REQUIRED_COLUMNS.issubset(df.columns)
+    }
+
+
+# --- Motores de Casamento (resolução de conflitos entre regras) ---
+
+# Orçamento padrão do solver exato antes de cair para o guloso (em segundos)
+OPTIMAL_TIME_BUDGET = 0.05
+
+
+class _BudgetExceeded(Exception):
+    """
+    Sinaliza que o solver exato estourou o orçamento de tempo.
+    """
+
+
+def _match_greedy(rule_index: RuleIndex, candidates: list[int], input_codes: frozenset[str]) -> list[int]:
+    """
+    Casamento guloso: percorre as regras em ordem de prioridade e usa cada uma
+    que ainda couber nos códigos restantes.
+    """
+    chosen = []
+    remaining = set(input_codes)
+    for position in candidates:
+        required_codes = rule_index.required[position]
+
+        # O usuário ainda tem TODOS os códigos exigidos por essa regra?
+        if required_codes <= remaining:
+            chosen.append(position)
+
+            # Remove os códigos usados do "bolso" do usuário para não serem reusados
+            remaining -= required_codes
+    return chosen
+
+
+def _match_optimal(
+    rule_index: RuleIndex,
+    candidates: list[int],
+    input_codes: frozenset[str],
+    time_budget: float = OPTIMAL_TIME_BUDGET
+) -> list[int]:
+    """
+    Casamento ótimo: escolhe regras disjuntas que cobrem o MAIOR número de
+    códigos da entrada (set packing), via DP com bitmask sobre os códigos.
+
+    Empates são resolvidos pela ordem de prioridade das regras. Se o
+    orçamento de tempo estourar, devolve o resultado do casamento guloso,
+    mantendo a latência do pior caso previsível.
+    """
+    # Só os códigos que aparecem em alguma regra candidata entram na máscara
+    bit_of = {}
+    for position in candidates:
+        for code in rule_index.required[position]:
+            bit_of.setdefault(code, len(bit_of))
+
+    rule_masks = []
+    for position in candidates:
+        mask = 0
+        for code in rule_index.required[position]:
+            mask |= 1 << bit_of[code]
+        rule_masks.append((position, mask, len(rule_index.required[position])))
+
+    # Regras agrupadas SÓ pelo seu bit mais baixo, em ordem de prioridade. Na
+    # busca, todo bit abaixo do código livre mais baixo já foi decidido (usado
+    # ou descartado), então só cabem as regras cujo bit mais baixo é ele
+    rules_by_bit: dict[int, list[tuple[int, int, int]]] = {}
+    for position, mask, size in rule_masks:
+        rules_by_bit.setdefault((mask & -mask).bit_length() - 1, []).append((position, mask, size))
+
+    deadline = time.perf_counter() + time_budget
+    memo: dict[int, tuple[int, tuple[int, ...]]] = {0: (0, ())}
+
+    def best(mask: int) -> tuple[int, tuple[int, ...]]:
+        if mask in memo:
+            return memo[mask]
+        if time.perf_counter() > deadline:
+            raise _BudgetExceeded
+
+        lowest = (mask & -mask).bit_length() - 1
+
+        # Opção 1: usar uma regra que cubra o código mais baixo ainda livre
+        best_score, best_choice = -1, ()
+        for position, rule_mask, size in rules_by_bit.get(lowest, ()):
+            if rule_mask & mask == rule_mask:
+                score, choice = best(mask & ~rule_mask)
+                if score + size > best_score:
+                    best_score, best_choice = score + size, (position,) + choice
+
+        # Opção 2: deixar esse código sem regra
+        score, choice = best(mask & ~(1 << lowest))
+        if score > best_score:
+            best_score, best_choice = score, choice
+
+        memo[mask] = (best_score, best_choice)
+        return memo[mask]
+
+    try:
+        _, chosen = best((1 << len(bit_of)) - 1)
+    except (_BudgetExceeded, RecursionError):
+        return _match_greedy(rule_index, candidates, input_codes)
+
+    return sorted(chosen)
+
+
+MATCHING_ENGINES: dict[str, Callable[[RuleIndex, list[int], frozenset[str]], list[int]]] = {
+    "greedy": _match_greedy,
+    "optimal": _match_optimal,
+}
+
+# Backends que encontram as regras candidatas (todas com códigos contidos na entrada)
+CANDIDATE_BACKENDS: dict[str, Callable[[RuleIndex, frozenset[str]], list[int]]] = {
+    "index": RuleIndex.candidates,
+    "bitset": RuleIndex.candidates_bitset,
+}
+
+
 def find_equivalencies(
-    all_data: dict[str, pd.DataFrame], 
-    selected_university: str, 
-    course_codes_str: str
+    all_data: Mapping[str, pd.DataFrame | RuleIndex],
+    selected_university: str,
+    course_codes_str: str,
+    engine: str = "greedy",
+    backend: str = "index"
 ) -> list[dict]:
-    
+    """
+    Busca as regras de equivalência que casam com os códigos informados.
+
+    `all_data` pode conter os DataFrames crus de cada aba ou os RuleIndex já
+    compilados por `compile_rule_indexes` (caminho rápido, usado pelo app).
+
+    `engine` escolhe como resolver conflitos entre regras que disputam os
+    mesmos códigos (ver MATCHING_ENGINES): "greedy" (padrão, prioriza regras
+    compostas) ou "optimal" (maximiza o número de códigos cobertos).
+
+    `backend` escolhe como as regras candidatas são encontradas (ver
+    CANDIDATE_BACKENDS): "index" (índice invertido) ou "bitset" (teste
+    vetorizado sobre a aba inteira).
+    """
+    if engine not in MATCHING_ENGINES:
+        raise ValueError(f"Motor de casamento desconhecido: '{engine}'. Opções: {', '.join(MATCHING_ENGINES)}")
+    if backend not in CANDIDATE_BACKENDS:
+        raise ValueError(f"Backend desconhecido: '{backend}'. Opções: {', '.join(CANDIDATE_BACKENDS)}")
+
     results = []
-    
-    university_df = all_data.get(selected_university)
-    if university_df is None:
+
+    rule_index = all_data.get(selected_university)
+    if rule_index is None:
         return [{"error": f"Dados para a universidade '{selected_university}' não encontrados."}]
+    if not isinstance(rule_index, RuleIndex):
+        rule_index = RuleIndex(rule_index)
 
-    # --- CORREÇÃO 1: Limpeza da Entrada (Input do Usuário) ---
-    # Substituímos '+' por espaço para garantir que "INF01+INF02" vire {"INF01", "INF02"}
-    # Isso resolve o caso se o usuário colar direto com o +.
-    cleaned_str = course_codes_str.replace("+", " ").replace(",", " ").replace("\n", " ")
-    
-    # Set de códigos do usuário (Input)
-    input_codes_set = {code.strip().upper() for code in cleaned_str.split() if code.strip()}
-
-    # --- CORREÇÃO 2: Prioridade de Regras (Sort by Complexity) ---
-    # Criamos uma cópia para não bagunçar o original
-    df_sorted = university_df.copy()
-    
-    # Criamos uma coluna temporária para medir o tamanho da regra.
-    # Regras como "INF01+INF02" são mais longas que "INF01".
-    # Queremos processar as MAIORES primeiro.
-    df_sorted['complexity'] = df_sorted['Códigos Origem'].astype(str).apply(len)
-    
-    # Ordena do maior para o menor (Regras compostas vêm pro topo)
-    df_sorted = df_sorted.sort_values(by='complexity', ascending=False)
-
-    # Itera sobre as regras ordenadas
-    for index, rule in df_sorted.iterrows():
-        origin_codes_str = str(rule['Códigos Origem'])
-        
-        # --- CORREÇÃO 3: Parse da Regra da Planilha ---
-        # Quebra a regra "INF1+INF2" em um conjunto {"INF1", "INF2"}
-        required_codes = {c.strip().upper() for c in origin_codes_str.split('+') if c.strip()}
-        
-        # Lógica: O usuário tem TODOS os códigos exigidos por essa regra?
-        if required_codes and required_codes.issubset(input_codes_set):
-            # CASAMENTO PERFEITO!
-            result_details = {
-                "status": "Encontrado",
-                "origin_codes": rule['Códigos Origem'],
-                "origin_names": rule['Nomes Origem'],
-                "is_equivalent": rule['Equivalente?'],
-                "dest_codes": rule['Códigos UFRJ Destino'],
-                "dest_names": rule['Nomes UFRJ Destino'],
-                "justification": rule['Justificativa Parecer']
-            }
-            results.append(result_details)
-            
-            # Remove os códigos usados do "bolso" do usuário para não serem reusados
-            input_codes_set -= required_codes
+    input_codes_set = _parse_input_codes(course_codes_str)
+
+    # Só visita regras que compartilham códigos com a entrada, já em ordem de prioridade
+    candidates = CANDIDATE_BACKENDS[backend](rule_index, input_codes_set)
+    chosen = MATCHING_ENGINES[engine](rule_index, candidates, input_codes_set)
+
+    remaining = set(input_codes_set)
+    for position in chosen:
+        results.append(rule_index.result_details(position))
+        remaining -= rule_index.required[position]
 
     # Sobras: Códigos que o usuário tem, mas não serviram para nenhuma regra
-    for remaining_code in sorted(list(input_codes_set)):
+    for remaining_code in sorted(remaining):
         results.append({
             "input_code": remaining_code,
             "status": "Não Encontrado na Planilha"
         })
 
-    return results
\ No newline at end of file
+    return results
+
+
+# --- Análise em Lote (vários alunos de uma vez) ---
+
+# Índices compilados compartilhados pelos processos do pool (definidos no initializer)
+_BATCH_INDEXES: dict[str, RuleIndex] = {}
+
+# Abaixo desse número de pedidos não compensa subir um pool de processos
+BATCH_POOL_THRESHOLD = 64
+
+
+
+def _init_batch_worker(rule_indexes: dict[str, RuleIndex]):
+    """
+    Initializer do pool: recebe os índices UMA vez por processo.
+    """
+    global _BATCH_INDEXES
+    _BATCH_INDEXES = rule_indexes
+
+
+def _analyze_student(
+    request: tuple[str, str, str],
+    rule_indexes: dict[str, RuleIndex] | None = None,
+    engine: str = "greedy",
+    backend: str = "index"
+) -> list[dict]:
+    """
+    Roda find_equivalencies para um pedido e devolve as linhas "tidy" do resultado.
+    """
+    student_id, university, codes = request
+    if rule_indexes is None:
+        rule_indexes = _BATCH_INDEXES
+
+    return [
+        {"student_id": student_id, "university": university, **result}
+        for result in find_equivalencies(rule_indexes, university, codes, engine, backend)
+    ]
+
+
+def iter_equivalencies_batch(
+    all_data: Mapping[str, pd.DataFrame | RuleIndex],
+    requests: Iterable[tuple[str, str, str]],
+    max_workers: int | None = None,
+    engine: str = "greedy",
+    backend: str = "index"
+) -> Iterator[dict]:
+    """
+    Analisa vários pedidos de equivalência e devolve os resultados linha a linha.
+
+    As regras são compiladas uma única vez e compartilhadas por todo o lote.
+    Pedidos independentes são distribuídos em um pool de processos quando o
+    lote é grande o suficiente; a ordem de saída segue a ordem de entrada.
+
+    Args:
+        all_data: DataFrames das abas ou RuleIndex já compilados.
+        requests: Tuplas (student_id, university, course_codes_str).
+        max_workers (int | None): Número de processos. 1 força execução sequencial.
+        engine (str): Motor de casamento repassado a find_equivalencies.
+        backend (str): Backend de candidatas repassado a find_equivalencies.
+
+    Yields:
+        dict: Uma linha por resultado, com 'student_id' e 'university' além dos
+              campos devolvidos por find_equivalencies.
+    """
+    rule_indexes = {
+        name: data if isinstance(data, RuleIndex) else RuleIndex(data)
+        for name, data in all_data.items()
+        if isinstance(data, RuleIndex) or REQUIRED_COLUMNS.issubset(data.columns)
+    }
+    requests = list(requests)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers <= 1 or len(requests) < BATCH_POOL_THRESHOLD:
+        for request in requests:
+            yield from _analyze_student(request, rule_indexes, engine, backend)
+        return
+
+    chunksize = max(1, len(requests) // (max_workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=MP_CONTEXT,
+        initializer=_init_batch_worker,
+        initargs=(rule_indexes,)
+    ) as executor:
+        n = len(requests)
+        for rows in executor.map(
+            _analyze_student, requests, [None] * n, [engine] * n, [backend] * n, chunksize=chunksize
+        ):
+            yield from rows
+
+
+def find_equivalencies_batch(
+    all_data: Mapping[str, pd.DataFrame | RuleIndex],
+    requests: Iterable[tuple[str, str, str]],
+    max_workers: int | None = None,
+    engine: str = "greedy",
+    backend: str = "index"
+) -> pd.DataFrame:
+    """
+    Versão "tidy" de iter_equivalencies_batch: um DataFrame com uma linha por resultado.
+    """
+    return pd.DataFrame(list(iter_equivalencies_batch(all_data, requests, max_workers, engine, backend)))
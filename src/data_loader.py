@@ -1,6 +1,13 @@
+import hashlib
+import io
+import os
+from typing import Any
+
 import pandas as pd
 from pandas import DataFrame
 
+from disk_cache import read_entry, write_entry
+
 
 # Definindo o set de colunas obrigatórias fora da função
 REQUIRED_COLUMNS = {
@@ -12,13 +19,68 @@ REQUIRED_COLUMNS = {
     "Justificativa Parecer"
 }
 
+# Diretório do cache compilado da planilha (pode ser sobrescrito pelo .env)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CACHE_DIR = os.getenv("SPREADSHEET_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache", "planilhas"))
+
+# Quantas versões compiladas da planilha manter em disco
+MAX_CACHE_ENTRIES = 5
+
+# Muda sempre que o formato do que é gravado no cache mudar
+CACHE_FORMAT_VERSION = 3
+
+# Valores da coluna 'Equivalente?' que significam "equivalente"
+EQUIVALENT_VALUES = {'sim', 's', 'true', '1', 'verdadeiro'}
+
+# Colunas de texto muito repetidas entre linhas, guardadas como categóricas
+CATEGORICAL_COLUMNS = [
+    "Códigos Origem",
+    "Nomes Origem",
+    "Códigos UFRJ Destino",
+    "Nomes UFRJ Destino",
+    "Justificativa Parecer"
+]
+
+
+def _excel_source(source: Any) -> Any:
+    """
+    Devolve uma fonte que pode ser lida de novo desde o início: bytes viram
+    BytesIO e objetos de arquivo (ex.: UploadedFile) são rebobinados.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
 
-def load_spreadsheet(file_path: str) -> dict[str, DataFrame] | None:
+def _sheet_headers(excel_file: pd.ExcelFile) -> dict[str, DataFrame]:
+    """
+    Lê apenas o cabeçalho de cada aba (nrows=0, em streaming no workbook
+    read-only) e devolve DataFrames vazios só com as colunas. Quem acha o
+    cabeçalho é o próprio pandas, então ele é o mesmo de um pd.read_excel completo.
+    """
+    return {sheet_name: excel_file.parse(sheet_name, nrows=0) for sheet_name in excel_file.sheet_names}
+
+
+def load_spreadsheet(
+    file_path: Any,
+    required_only: bool = False,
+    sheet_names: list[str] | None = None
+) -> dict[str, DataFrame] | None:
     """
     Carrega todas as abas de uma planilha Excel em um dicionário de DataFrames.
 
     Args:
-        file_path (str): O caminho para o arquivo .xlsx.
+        file_path: O caminho para o arquivo .xlsx (ou seus bytes / um objeto de arquivo).
+        required_only (bool): Se True, lê apenas as abas de universidade e,
+                              nelas, apenas as colunas de REQUIRED_COLUMNS.
+                              Das demais abas só o cabeçalho é lido. Se
+                              nenhuma aba tiver as colunas obrigatórias,
+                              devolve os cabeçalhos (DataFrames vazios) de
+                              todas as abas, para que a validação diga quais
+                              colunas faltam.
+        sheet_names (list[str] | None): Lê somente essas abas.
 
     Returns:
         dict[str, DataFrame] | None: Um dicionário onde cada chave é o nome de uma aba
@@ -26,9 +88,24 @@ def load_spreadsheet(file_path: str) -> dict[str, DataFrame] | None:
                                      Retorna None se o arquivo não for encontrado ou ocorrer um erro.
     """
     try:
-        spreadsheet_data = pd.read_excel(file_path, sheet_name=None)
-        # print(f"Planilha '{file_path}' carregada com sucesso.")
-        return spreadsheet_data
+        if not required_only:
+            spreadsheet_data = pd.read_excel(_excel_source(file_path), sheet_name=sheet_names)
+            # print(f"Planilha '{file_path}' carregada com sucesso.")
+            return spreadsheet_data
+
+        # Um único workbook read-only serve para achar as abas e para lê-las
+        with pd.ExcelFile(_excel_source(file_path), engine="openpyxl") as excel_file:
+            if sheet_names is None:
+                headers = _sheet_headers(excel_file)
+                sheet_names = [
+                    sheet_name for sheet_name, header in headers.items()
+                    if REQUIRED_COLUMNS.issubset(header.columns)
+                ]
+                if not sheet_names:
+                    return headers
+            if not sheet_names:
+                return {}
+            return excel_file.parse(sheet_names, usecols=lambda column: column in REQUIRED_COLUMNS)
     except FileNotFoundError:
         # print(f"ERRO: O arquivo não foi encontrado no caminho: {file_path}")
         return None
@@ -37,6 +114,48 @@ def load_spreadsheet(file_path: str) -> dict[str, DataFrame] | None:
         return None
 
 
+def is_equivalent_value(value: Any) -> bool:
+    """
+    Normaliza um valor da coluna 'Equivalente?' ("Sim", "s", True, 1...) para bool.
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in EQUIVALENT_VALUES
+
+
+def compact_university_sheet(df: DataFrame) -> DataFrame:
+    """
+    Converte a aba de uma universidade para a representação compacta usada em memória.
+
+    - mantém apenas as colunas de REQUIRED_COLUMNS;
+    - normaliza 'Equivalente?' para bool uma única vez, na carga;
+    - guarda códigos, nomes e justificativas como categóricas, para que textos
+      repetidos entre linhas (ex.: justificativas padrão) sejam armazenados uma vez só.
+
+    Args:
+        df (DataFrame): A aba como lida do .xlsx.
+
+    Returns:
+        DataFrame: Uma nova aba compacta, com as mesmas colunas obrigatórias.
+    """
+    compact_df = df[[column for column in df.columns if column in REQUIRED_COLUMNS]].copy()
+    compact_df["Equivalente?"] = compact_df["Equivalente?"].map(is_equivalent_value).astype(bool)
+    for column in CATEGORICAL_COLUMNS:
+        compact_df[column] = compact_df[column].astype("category")
+    return compact_df
+
+
+def compact_spreadsheet(spreadsheet_data: dict[str, DataFrame]) -> dict[str, DataFrame]:
+    """
+    Aplica compact_university_sheet a todas as abas de universidade.
+    Abas sem as colunas obrigatórias são mantidas como estão.
+    """
+    return {
+        sheet_name: compact_university_sheet(df) if REQUIRED_COLUMNS.issubset(df.columns) else df
+        for sheet_name, df in spreadsheet_data.items()
+    }
+
+
 def get_university_list(spreadsheet_data: dict[str, DataFrame]) -> list[str]:
     """
     Extrai a lista de nomes das universidades (abas) do dicionário de dados,
@@ -62,3 +181,37 @@ def get_university_list(spreadsheet_data: dict[str, DataFrame]) -> list[str]:
         for sheet_name, df in spreadsheet_data.items()
         if REQUIRED_COLUMNS.issubset(df.columns)
     ]
+
+
+
+def _cache_path(content_hash: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{content_hash}.v{CACHE_FORMAT_VERSION}.pkl")
+
+
+def load_spreadsheet_cached(content: bytes, cache_dir: str = CACHE_DIR) -> dict[str, DataFrame] | None:
+    """
+    Carrega uma planilha a partir dos seus bytes, usando um cache compilado em disco.
+
+    O cache é indexado pelo hash SHA-256 do conteúdo do .xlsx: o parse pelo
+    openpyxl (a parte mais lenta) só acontece quando o arquivo de origem muda.
+    Apenas as abas de universidade e as colunas obrigatórias são lidas, já na
+    representação compacta de compact_university_sheet.
+
+    Args:
+        content (bytes): O conteúdo bruto do arquivo .xlsx.
+        cache_dir (str): Diretório onde as versões compiladas são guardadas.
+
+    Returns:
+        dict[str, DataFrame] | None: O mesmo retorno de load_spreadsheet.
+    """
+    path = _cache_path(hashlib.sha256(content).hexdigest(), cache_dir)
+
+    spreadsheet_data = read_entry(path)
+    if spreadsheet_data is not None:
+        return spreadsheet_data
+
+    spreadsheet_data = load_spreadsheet(content, required_only=True)
+    if spreadsheet_data:
+        spreadsheet_data = compact_spreadsheet(spreadsheet_data)
+        write_entry(path, spreadsheet_data, max_entries=MAX_CACHE_ENTRIES)
+    return spreadsheet_data
@@ -0,0 +1,66 @@
+import os
+import pickle
+from typing import Any, Optional
+
+
+def read_entry(path: str) -> Optional[Any]:
+    """
+    Lê uma entrada (pickle) de um cache em disco.
+
+    Em um acerto o mtime do arquivo é atualizado, para que a poda de
+    write_entry mantenha as entradas mais usadas. Entradas corrompidas (ou de
+    um formato incompatível) são apagadas e tratadas como ausentes.
+    """
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+def write_entry(
+    path: str,
+    value: Any,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None
+):
+    """
+    Grava uma entrada de forma atômica (arquivo temporário + os.replace) e
+    poda o diretório dela: as entradas `.pkl` usadas há mais tempo são
+    removidas até sobrarem no máximo `max_entries` arquivos e `max_bytes` bytes.
+
+    Erros de disco (somente leitura, sem espaço...) são ignorados: o cache em
+    disco é apenas uma otimização.
+    """
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+        entries = sorted(
+            (os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".pkl")),
+            key=os.path.getmtime,
+            reverse=True
+        )
+        total = 0
+        for count, entry_path in enumerate(entries, start=1):
+            total += os.path.getsize(entry_path)
+            if (max_entries is not None and count > max_entries) or (max_bytes is not None and total > max_bytes):
+                os.remove(entry_path)
+    except OSError:
+        pass
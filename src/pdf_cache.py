@@ -0,0 +1,121 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import pandas as pd
+
+from disk_cache import read_entry, write_entry
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash SHA-256 do conteúdo de um arquivo (a chave do cache).
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry_size(entry: dict[str, Any]) -> int:
+    """
+    Estimativa do tamanho em memória de uma entrada (códigos + tabelas).
+    """
+    size = sys.getsizeof(entry.get("codes", ""))
+    for df in entry.get("tables", []):
+        size += int(df.memory_usage(deep=True).sum()) if isinstance(df, pd.DataFrame) else sys.getsizeof(df)
+    return size
+
+
+class PdfResultCache:
+    """
+    Cache LRU, limitado por tamanho, dos resultados de extração de PDFs.
+
+    A chave é o SHA-256 dos bytes do PDF, então o mesmo arquivo enviado por
+    outra pessoa (ou de novo, depois de recarregar a página) não passa pela
+    extração outra vez. Opcionalmente as entradas também são gravadas em
+    disco e sobrevivem a reinícios do processo.
+
+    Atributos:
+        max_bytes (int): Tamanho máximo (estimado) das entradas em memória.
+        cache_dir (str | None): Diretório de persistência; None = só memória.
+        max_disk_bytes (int): Tamanho máximo das entradas em disco.
+        stats (dict): Contadores 'hits', 'disk_hits', 'misses' e 'evictions'.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._entries: "OrderedDict[str, tuple[dict[str, Any], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["disk_hits"]) / lookups if lookups else 0.0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _store_in_memory(self, key: str, entry: dict[str, Any]):
+        size = _entry_size(entry)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (entry, size)
+        self._total_bytes += size
+
+        while self._total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self.stats["evictions"] += 1
+
+    def _read_from_disk(self, key: str) -> Optional[dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        return read_entry(self._disk_path(key))
+
+    def _write_to_disk(self, key: str, entry: dict[str, Any]):
+        if self.cache_dir:
+            write_entry(self._disk_path(key), entry, max_bytes=self.max_disk_bytes)
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Busca uma entrada pelo hash do PDF (memória primeiro, depois disco).
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key][0]
+
+            entry = self._read_from_disk(key)
+            if entry is not None:
+                self.stats["disk_hits"] += 1
+                self._store_in_memory(key, entry)
+                return entry
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, entry: dict[str, Any]):
+        """
+        Guarda uma entrada ({'codes': str, 'tables': list[DataFrame]}) no cache.
+        """
+        with self._lock:
+            self._store_in_memory(key, entry)
+            self._write_to_disk(key, entry)
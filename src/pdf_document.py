@@ -0,0 +1,172 @@
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Union
+
+import pdfplumber
+
+# Diretório em memória (tmpfs) para os backends que exigem um caminho em disco
+TMPFS_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+PdfSource = Union[str, os.PathLike, bytes, bytearray, memoryview, Any]
+
+
+class ParsedDocument:
+    """
+    Camada única de ingestão de PDFs e modelo de documento compartilhado.
+
+    Aceita um caminho, bytes, memoryview ou um objeto de arquivo (como o
+    UploadedFile do Streamlit), abre o PDF uma única vez e compartilha o
+    documento parseado entre todos os extratores (uploader de disciplinas,
+    pdf_parser e UFRJ). Só toca o disco quando um backend realmente precisa
+    de um caminho (ex.: Camelot) e, nesse caso, usa tmpfs.
+
+    O texto simples, o texto com layout e as palavras (com posições) de cada
+    página são extraídos sob demanda, no primeiro acesso, e guardados: cada
+    página é parseada no máximo uma vez por modo.
+    """
+
+    def __init__(self, source: PdfSource):
+        """
+        Args:
+            source: Caminho, bytes/bytearray/memoryview ou objeto de arquivo.
+        """
+        self.path: Optional[str] = None
+        self.data: Optional[bytes] = None
+
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+        elif isinstance(source, bytes):
+            self.data = source
+        elif isinstance(source, (bytearray, memoryview)):
+            self.data = bytes(source)
+        elif hasattr(source, "getvalue"):
+            self.data = source.getvalue()
+        elif hasattr(source, "read"):
+            if hasattr(source, "seek"):
+                source.seek(0)
+            self.data = source.read()
+        else:
+            raise TypeError(f"Fonte de PDF não suportada: {type(source).__name__}")
+
+        self._pdf = None
+        self._temp_path: Optional[str] = None
+        self._texts: dict[int, str] = {}
+        self._layout_texts: dict[int, str] = {}
+        self._words: dict[int, list[dict]] = {}
+
+    @property
+    def pdf(self) -> pdfplumber.PDF:
+        """
+        O documento pdfplumber, aberto na primeira vez que é pedido.
+        """
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.path if self.path else io.BytesIO(self.data))
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    def page_text(self, index: int) -> str:
+        """
+        Texto simples da página `index` (0-based); "" se a página não tiver texto.
+        """
+        if index not in self._texts:
+            self._texts[index] = self.pdf.pages[index].extract_text() or ""
+        return self._texts[index]
+
+    def page_layout_text(self, index: int, cache: bool = True) -> str:
+        """
+        Texto da página `index` preservando o layout (colunas separadas por espaços).
+
+        Com `cache=False` o texto não é guardado e os objetos da página no
+        pdfplumber são liberados logo após a extração (leitura em streaming,
+        uma página por vez).
+        """
+        if index in self._layout_texts:
+            return self._layout_texts[index]
+
+        page = self.pdf.pages[index]
+        text = page.extract_text(layout=True) or ""
+        if not cache:
+            page.close()
+            return text
+
+        self._layout_texts[index] = text
+        return text
+
+    def page_words(self, index: int) -> list[dict]:
+        """
+        Palavras da página `index`, com suas caixas (x0, x1, top, bottom).
+        """
+        if index not in self._words:
+            self._words[index] = self.pdf.pages[index].extract_words()
+        return self._words[index]
+
+    def full_text(self) -> str:
+        """
+        Texto simples de todas as páginas com texto, cada uma terminada por "\n".
+        """
+        return "".join(f"{text}\n" for text in map(self.page_text, range(self.page_count)) if text)
+
+    def as_path(self) -> str:
+        """
+        Um caminho em disco para backends que não aceitam bytes.
+
+        Documentos abertos de um caminho devolvem o próprio caminho; os demais
+        são gravados UMA vez em tmpfs e o arquivo é removido em `close()`.
+        """
+        if self.path:
+            return self.path
+        if self._temp_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=TMPFS_DIR) as tfile:
+                tfile.write(self.data)
+                self._temp_path = tfile.name
+        return self._temp_path
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self._temp_path and os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+        self._temp_path = None
+
+    def __enter__(self) -> "ParsedDocument":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def describe_pdf_source(source: Union[PdfSource, ParsedDocument]) -> str:
+    """
+    Nome legível de uma fonte de PDF, para mensagens de erro.
+    """
+    if isinstance(source, ParsedDocument):
+        return source.path or "<PDF em memória>"
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, "name", None) or "<PDF em memória>"
+
+
+@contextmanager
+def open_pdf_document(source: Union[PdfSource, ParsedDocument]) -> Iterator[ParsedDocument]:
+    """
+    Devolve um ParsedDocument para `source`.
+
+    Se `source` já for um ParsedDocument ele é reaproveitado e NÃO é fechado na
+    saída (quem o criou é dono dele); caso contrário, um novo documento é
+    aberto e fechado ao final do bloco.
+    """
+    if isinstance(source, ParsedDocument):
+        yield source
+        return
+
+    document = ParsedDocument(source)
+    try:
+        yield document
+    finally:
+        document.close()
@@ -1,9 +1,22 @@
 # 1. Bibliotecas padrão (Standard Library)
+import hashlib
+import json
 import os
-from typing import List, Dict
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, List, Dict, Iterable, Iterator, Optional, Tuple
 
 # 2. Bibliotecas de terceiros (Third-party)
 from fpdf import FPDF
+from fpdf.image_parsing import preload_image
+from PIL import Image
+
+# 3. Módulos da aplicação (Local application)
+from core import MP_CONTEXT
+from data_loader import is_equivalent_value
 
 # --- Constantes de Layout ---
 PAGE_WIDTH = 297
@@ -21,174 +34,269 @@ COL_WIDTHS = {
 BASE_LINE_HEIGHT = 5 
 CELL_PADDING = 2
 
+# Largura de cada coluna da tabela, na ordem em que são desenhadas
+CELL_WIDTHS = [
+    COL_WIDTHS["dest_code"],
+    COL_WIDTHS["dest_name"],
+    COL_WIDTHS["origin_code"],
+    COL_WIDTHS["origin_name"],
+    COL_WIDTHS["parecer"],
+    COL_WIDTHS["justificativa"]
+]
+
+# --- Cabeçalho (estático: montado uma vez e redesenhado em cada página) ---
+LOGO_WIDTH = 30  # mm
+LOGO_DPI = 300   # resolução em que o logo é embutido (suficiente para impressão)
+
+INSTITUTION_LINES = (
+    "UNIVERSIDADE FEDERAL DO RIO DE JANEIRO",
+    "Centro de Ciências Matemáticas e da Natureza",
+    "Instituto de Computação"
+)
+REPORT_TITLE = "Parecer de Análise de Equivalência de Disciplinas"
+
+TABLE_GROUP_HEADERS = (
+    (COL_WIDTHS["dest_code"] + COL_WIDTHS["dest_name"], "Disciplinas a Serem Dispensadas no IC/UFRJ"),
+    (COL_WIDTHS["origin_code"] + COL_WIDTHS["origin_name"], "Disciplinas Cursadas na IES de Origem"),
+    (COL_WIDTHS["parecer"] + COL_WIDTHS["justificativa"], "Análise de Equivalência")
+)
+TABLE_COLUMN_HEADERS = tuple(zip(CELL_WIDTHS, ("Código", "Nome", "Código", "Nome", "Parecer", "Justificativa")))
+
+
+@lru_cache(maxsize=8)
+def _decode_logo(logo_path: Optional[str]) -> Optional[Image.Image]:
+    """
+    Lê e reduz o logo para LOGO_DPI UMA vez por processo.
+
+    Returns:
+        A imagem já reduzida (compartilhada por todos os relatórios, não deve
+        ser alterada), ou None se o arquivo não existir.
+    """
+    if not logo_path or not os.path.exists(logo_path):
+        return None
+
+    target_width = round(LOGO_WIDTH / 25.4 * LOGO_DPI)
+    with Image.open(logo_path) as img:
+        if img.width > target_width:
+            return img.resize((target_width, round(img.height * target_width / img.width)), Image.LANCZOS)
+        return img.copy()
+
+
+class WrapCache:
+    """
+    Cache LRU, limitado por número de entradas, das linhas já quebradas de um texto.
+
+    Os mesmos nomes de disciplina e justificativas padrão se repetem em muitas
+    linhas e relatórios; com o cache, cada combinação (texto, largura, fonte)
+    é medida com as chamadas de largura de string do fpdf uma única vez por
+    processo. Compartilhado por todas as chamadas de create_pdf_bytes.
+
+    Atributos:
+        max_entries (int): Número máximo de textos guardados.
+        stats (dict): Contadores 'hits', 'misses' e 'evictions'.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        self._entries: "OrderedDict[tuple, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get(self, key: tuple) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return lines
+
+    def put(self, key: tuple, lines: Tuple[str, ...]):
+        with self._lock:
+            self._entries[key] = lines
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache de quebra de linhas compartilhado pelo processo inteiro
+WRAP_CACHE = WrapCache()
+
+
+def _row_texts(row_data: Dict) -> List[str]:
+    """
+    Textos das seis células de uma linha, na ordem de CELL_WIDTHS
+    (tudo convertido para string antes de ir para o PDF).
+    """
+    is_equivalent = is_equivalent_value(row_data.get("is_equivalent", "Não"))
+    return [
+        str(row_data.get("dest_codes") or ""),
+        str(row_data.get("dest_names") or ""),
+        str(row_data.get("origin_codes") or ""),
+        str(row_data.get("origin_names") or ""),
+        "Favorável" if is_equivalent else "Desfavorável",
+        str(row_data.get("justification") or "")
+    ]
+
+
 class CustomPDF(FPDF):
     """
     Classe customizada do FPDF para criar o cabeçalho e rodapé padronizados.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.logo_path = None
+        self._logo_path = None
+        self._logo_name: Optional[str] = None
+        self.section_title: Optional[str] = None
         self.set_margins(MARGIN, MARGIN, MARGIN)
 
+    @property
+    def logo_path(self) -> Optional[str]:
+        return self._logo_path
+
+    @logo_path.setter
+    def logo_path(self, logo_path: Optional[str]):
+        """
+        Carrega o logo já reduzido (ver _decode_logo) no cache de imagens deste
+        documento com o preload_image do fpdf: o arquivo não é lido de novo a
+        cada página, e a imagem é embutida uma única vez e referenciada por
+        todas (pelo nome devolvido pelo preload).
+        """
+        self._logo_path = logo_path
+        image = _decode_logo(logo_path)
+        self._logo_name = preload_image(self.image_cache, image)[0] if image is not None else None
+
     def header(self):
         # --- 1. Cabeçalho Oficial (Logo e Texto) ---
-        if self.logo_path and os.path.exists(self.logo_path):
-            self.image(self.logo_path, self.l_margin, 8, 30)
+        if self._logo_name:
+            self.image(self._logo_name, self.l_margin, 8, LOGO_WIDTH)
 
-        x_after_logo = self.l_margin + 30 + 5
+        x_after_logo = self.l_margin + LOGO_WIDTH + 5
         self.set_xy(x_after_logo, 8)
-        
+
         self.set_font("Arial", "B", 10)
-        self.cell(0, 5, "UNIVERSIDADE FEDERAL DO RIO DE JANEIRO", 0, 1, "L")
-        self.set_x(x_after_logo)
-        self.cell(0, 5, "Centro de Ciências Matemáticas e da Natureza", 0, 1, "L")
-        self.set_x(x_after_logo)
-        self.cell(0, 5, "Instituto de Computação", 0, 1, "L")
-        
+        for text in INSTITUTION_LINES:
+            self.set_x(x_after_logo)
+            self.cell(0, 5, text, 0, 1, "L")
+
         # --- 2. Título do Documento ---
         self.set_font("Arial", "B", 16)
         self.ln(10)
-        self.cell(0, 10, "Parecer de Análise de Equivalência de Disciplinas", 0, 1, "C")
+        self.cell(0, 10, REPORT_TITLE, 0, 1, "C")
+
+        # Relatório combinado: identifica o aluno da seção atual
+        if self.section_title:
+            self.set_font("Arial", "B", 11)
+            self.cell(0, 6, f"Aluno: {self.section_title}", 0, 1, "L")
         self.ln(5)
 
-        # --- 3. Cabeçalho da Tabela ---
+        # --- 3. Cabeçalho da Tabela (grupos e títulos das 6 colunas) ---
         self.set_font("Arial", "B", 9)
         self.set_fill_color(230, 230, 230)
         self.set_text_color(0, 0, 0)
-        
-        w_dest = COL_WIDTHS["dest_code"] + COL_WIDTHS["dest_name"]
-        w_orig = COL_WIDTHS["origin_code"] + COL_WIDTHS["origin_name"]
-        w_analise = COL_WIDTHS["parecer"] + COL_WIDTHS["justificativa"] 
-        
-        self.cell(w_dest, BASE_LINE_HEIGHT, "Disciplinas a Serem Dispensadas no IC/UFRJ", 1, 0, "C", fill=True)
-        self.cell(w_orig, BASE_LINE_HEIGHT, "Disciplinas Cursadas na IES de Origem", 1, 0, "C", fill=True)
-        self.cell(w_analise, BASE_LINE_HEIGHT, "Análise de Equivalência", 1, 1, "C", fill=True) 
-
-        # Títulos das colunas (6 colunas)
-        self.cell(COL_WIDTHS["dest_code"], BASE_LINE_HEIGHT, "Código", 1, 0, "C", fill=True)
-        self.cell(COL_WIDTHS["dest_name"], BASE_LINE_HEIGHT, "Nome", 1, 0, "C", fill=True)
-        self.cell(COL_WIDTHS["origin_code"], BASE_LINE_HEIGHT, "Código", 1, 0, "C", fill=True)
-        self.cell(COL_WIDTHS["origin_name"], BASE_LINE_HEIGHT, "Nome", 1, 0, "C", fill=True)
-        self.cell(COL_WIDTHS["parecer"], BASE_LINE_HEIGHT, "Parecer", 1, 0, "C", fill=True)
-        self.cell(COL_WIDTHS["justificativa"], BASE_LINE_HEIGHT, "Justificativa", 1, 1, "C", fill=True) 
-
-    def _calculate_row_height(self, row_data: Dict) -> int:
+
+        for headers in (TABLE_GROUP_HEADERS, TABLE_COLUMN_HEADERS):
+            last = len(headers) - 1
+            for i, (width, text) in enumerate(headers):
+                self.cell(width, BASE_LINE_HEIGHT, text, 1, 1 if i == last else 0, "C", fill=True)
+
+    def _wrap_text(self, text: str, width: float) -> Tuple[str, ...]:
+        """
+        Quebra `text` nas linhas que cabem em `width` com a fonte atual.
+        O resultado vem do WRAP_CACHE quando o mesmo texto já foi medido.
+        """
+        key = (text, width, self.font_family, self.font_style, self.font_size_pt, self.c_margin)
+        lines = WRAP_CACHE.get(key)
+        if lines is None:
+            lines = tuple(self.multi_cell(
+                width,
+                BASE_LINE_HEIGHT,
+                text,
+                border=0,
+                align="L",
+                dry_run=True,
+                output="LINES"
+            ))
+            WRAP_CACHE.put(key, lines)
+        return lines
+
+    def _layout_row(self, row_data: Dict) -> Tuple[List[Tuple[str, ...]], float]:
         """
-        CALCULA a altura máxima necessária para a linha, ANTES de desenhá-la.
+        Quebra o texto de cada célula UMA única vez.
+
+        Returns:
+            tuple: (linhas de cada célula, altura total da linha da tabela).
+            As mesmas linhas servem para a altura e para o desenho.
         """
-        is_equivalent_str = str(row_data.get("is_equivalent", "Não")).lower()
-        is_equivalent = is_equivalent_str in ['sim', 's', 'true', '1', 'verdadeiro']
-        parecer_text = "Favorável" if is_equivalent else "Desfavorável"
-        
-        justification_text = row_data.get("justification") or ""
-
-        # --- CORREÇÃO APLICADA AQUI ---
-        # Garantir que tudo seja string antes de passar para o PDF
-        cell_texts = [
-            str(row_data.get("dest_codes") or ""),
-            str(row_data.get("dest_names") or ""),
-            str(row_data.get("origin_codes") or ""),
-            str(row_data.get("origin_names") or ""),
-            str(parecer_text),
-            str(justification_text)
-        ]
-        # --- FIM DA CORREÇÃO ---
-        
-        cell_widths = [
-            COL_WIDTHS["dest_code"],
-            COL_WIDTHS["dest_name"],
-            COL_WIDTHS["origin_code"],
-            COL_WIDTHS["origin_name"],
-            COL_WIDTHS["parecer"],
-            COL_WIDTHS["justificativa"]
-        ]
-        
-        max_lines = 1
         self.set_font("Arial", "", 8)
 
-        for i in range(len(cell_texts)):
-            text = cell_texts[i] # Agora é garantido que 'text' é uma string
-            width = cell_widths[i] - (CELL_PADDING * 2)
-            
-            if width <= 0: continue
-            
-            lines = self.multi_cell(
-                width, 
-                BASE_LINE_HEIGHT, 
-                text, 
-                border=0,
-                align="L", 
-                split_only=True
-            )
-            max_lines = max(max_lines, len(lines))
+        cell_lines = []
+        for text, width in zip(_row_texts(row_data), CELL_WIDTHS):
+            inner_width = width - (CELL_PADDING * 2)
+            cell_lines.append(self._wrap_text(text, inner_width) if inner_width > 0 else (text,))
 
-        return (max_lines * BASE_LINE_HEIGHT) + (CELL_PADDING / 2)
+        max_lines = max(1, *(len(lines) for lines in cell_lines))
+        return cell_lines, (max_lines * BASE_LINE_HEIGHT) + (CELL_PADDING / 2)
 
     def print_table_row(self, row_data: Dict):
         """
-        Imprime uma linha da tabela, usando a altura pré-calculada.
+        Imprime uma linha da tabela: mede e quebra os textos uma vez e desenha
+        as linhas já quebradas, centralizadas verticalmente em cada célula.
         """
-        self.set_font("Arial", "", 8)
+        cell_lines, total_row_height = self._layout_row(row_data)
         self.set_text_color(0, 0, 0)
-        
-        total_row_height = self._calculate_row_height(row_data)
-        
-        # --- Prepara os textos ---
-        is_equivalent_str = str(row_data.get("is_equivalent", "Não")).lower()
-        is_equivalent = is_equivalent_str in ['sim', 's', 'true', '1', 'verdadeiro']
-        parecer_text = "Favorável" if is_equivalent else "Desfavorável"
-        
-        justification_text = row_data.get("justification") or ""
-
-        # --- CORREÇÃO APLICADA AQUI ---
-        # Garantir que tudo seja string antes de passar para o PDF
-        cell_texts = [
-            str(row_data.get("dest_codes") or ""),
-            str(row_data.get("dest_names") or ""),
-            str(row_data.get("origin_codes") or ""),
-            str(row_data.get("origin_names") or ""),
-            str(parecer_text),
-            str(justification_text)
-        ]
-        # --- FIM DA CORREÇÃO ---
-        
-        cell_widths = [
-            COL_WIDTHS["dest_code"],
-            COL_WIDTHS["dest_name"],
-            COL_WIDTHS["origin_code"],
-            COL_WIDTHS["origin_name"],
-            COL_WIDTHS["parecer"],
-            COL_WIDTHS["justificativa"]
-        ]
-        
+
+        # A linha inteira vai para a próxima página se não couber nesta
+        if self.will_page_break(total_row_height):
+            self.add_page()
+
         start_y = self.get_y()
         current_x = self.l_margin
-        
-        for i in range(len(cell_texts)):
-            width = cell_widths[i]
-            text = cell_texts[i] # Agora é garantido que 'text' é uma string
-            
-            self.set_xy(current_x, start_y) 
-            
-            self.multi_cell(
-                width, 
-                total_row_height,
-                text, 
-                border=1, 
-                align="L",
-                new_x="RIGHT",
-                new_y="TOP"
-            )
+
+        for lines, width in zip(cell_lines, CELL_WIDTHS):
+            self.rect(current_x, start_y, width, total_row_height)
+
+            text_y = start_y + (total_row_height - len(lines) * BASE_LINE_HEIGHT) / 2
+            for line in lines:
+                self.set_xy(current_x + CELL_PADDING, text_y)
+                self.cell(width - (CELL_PADDING * 2), BASE_LINE_HEIGHT, line, border=0, align="L")
+                text_y += BASE_LINE_HEIGHT
+
             current_x += width
-            
-        self.set_y(start_y + total_row_height)
+
+        self.set_xy(self.l_margin, start_y + total_row_height)
 
 # --- Função Principal (a ser chamada pelo app.py) ---
 
-def create_pdf_bytes(results: list, logo_path: str) -> bytes:
+NO_RESULTS_MESSAGE = "Nenhum resultado encontrado para gerar o relatório."
+
+
+def _new_report_pdf(logo_path: Optional[str]) -> CustomPDF:
+    pdf = CustomPDF(orientation="L", unit="mm", format="A4")
+    pdf.logo_path = logo_path
+    pdf.set_auto_page_break(auto=True, margin=MARGIN)
+    pdf.set_font("Arial", size=12)
+    return pdf
+
+
+def _build_report(results: list, logo_path: Optional[str]) -> FPDF:
     """
-    Gera o conteúdo de um relatório em PDF como um objeto de bytes,
-    com cabeçalho oficial e tabela formatada.
+    Monta o documento de UM relatório (ainda não serializado).
     """
     found_results = [r for r in results if r.get("status") == "Encontrado"]
 
@@ -196,19 +304,221 @@ def create_pdf_bytes(results: list, logo_path: str) -> bytes:
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 10, "Nenhum resultado encontrado para gerar o relatório.", 0, 1, "C")
-        return bytes(pdf.output())
+        pdf.cell(0, 10, NO_RESULTS_MESSAGE, 0, 1, "C")
+        return pdf
 
-    pdf = CustomPDF(orientation="L", unit="mm", format="A4")
-    pdf.logo_path = logo_path
-    pdf.set_auto_page_break(auto=True, margin=MARGIN)
-    pdf.set_font("Arial", size=12)
+    pdf = _new_report_pdf(logo_path)
     pdf.add_page()
 
     for item in found_results:
         pdf.print_table_row(item)
 
-    return bytes(pdf.output())
+    return pdf
+
+
+def create_pdf_bytes(results: list, logo_path: str) -> bytes:
+    """
+    Gera o conteúdo de um relatório em PDF como um objeto de bytes,
+    com cabeçalho oficial e tabela formatada.
+    """
+    return bytes(_build_report(results, logo_path).output())
+
+
+# Relatórios maiores que isto saem da memória para um arquivo temporário
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def write_pdf(results: list, logo_path: Optional[str], sink: Optional[BinaryIO] = None) -> BinaryIO:
+    """
+    Gera um relatório e grava o PDF em um destino do tipo arquivo.
+
+    Não é streaming: o fpdf monta o documento inteiro no próprio buffer antes
+    de gravá-lo no destino, então o PDF completo passa pela memória. O que se
+    evita é só a cópia extra que create_pdf_bytes faz com bytes(). Quem evita
+    gerar o mesmo relatório de novo é get_report_download, que guarda o
+    resultado por hash dos resultados (results_fingerprint).
+
+    Args:
+        results (list): Resultados no formato de find_equivalencies.
+        logo_path (str | None): Logo do cabeçalho.
+        sink (BinaryIO | None): Destino (arquivo aberto, BytesIO, resposta HTTP...).
+                                Se None, um SpooledTemporaryFile é criado: fica
+                                em memória até SPOOL_MAX_SIZE e depois vai para o disco.
+
+    Returns:
+        BinaryIO: O próprio destino, reposicionado no início quando possível.
+    """
+    if sink is None:
+        sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    _build_report(results, logo_path).output(sink)
+    if sink.seekable():
+        sink.seek(0)
+    return sink
+
+
+def results_fingerprint(results: list) -> str:
+    """
+    Hash estável de uma lista de resultados (mesmos resultados -> mesmo relatório).
+    """
+    payload = json.dumps(results, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- Geração em Lote (vários pareceres de uma vez) ---
+
+# Abaixo deste número de relatórios o lote roda no próprio processo
+REPORT_POOL_THRESHOLD = 8
+
+
+def _write_atomic(pdf: FPDF, path: str) -> str:
+    """
+    Grava o documento em `path` sem deixar arquivos pela metade.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    pdf.output(temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def report_file_name(student_id: str) -> str:
+    """
+    Nome do arquivo do parecer de um aluno (só caracteres seguros).
+    """
+    safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(student_id)).strip("._")
+    return f"{safe_id or 'aluno'}_parecer.pdf"
+
+
+def write_report(results: list, path: str, logo_path: Optional[str] = None) -> str:
+    """
+    Gera um relatório e grava direto no disco.
+
+    Returns:
+        str: O caminho gravado.
+    """
+    return _write_atomic(_build_report(results, logo_path), path)
+
+
+def _init_report_worker(logo_path: Optional[str]):
+    """
+    Initializer do pool: decodifica o logo UMA vez por processo.
+    """
+    _decode_logo(logo_path)
+
+
+def unique_report_file_names(student_ids: Iterable[str]) -> List[str]:
+    """
+    report_file_name para cada aluno, sem repetições no lote.
+
+    Identificadores diferentes podem virar o mesmo nome seguro ("a/1" e
+    "a_1"), e o mesmo aluno pode aparecer duas vezes; nesses casos os nomes
+    seguintes ganham um sufixo ("a_1_2_parecer.pdf", ...) em vez de um
+    parecer sobrescrever o outro. A comparação ignora maiúsculas, por causa
+    de sistemas de arquivos que não as diferenciam.
+    """
+    names, taken = [], set()
+    for student_id in student_ids:
+        name = report_file_name(student_id)
+        suffix = 2
+        while name.casefold() in taken:
+            name = report_file_name(f"{student_id}_{suffix}")
+            suffix += 1
+        taken.add(name.casefold())
+        names.append(name)
+    return names
+
+
+def _write_student_report(report: tuple, output_dir: str, logo_path: Optional[str]) -> str:
+    file_name, results = report
+    return write_report(results, os.path.join(output_dir, file_name), logo_path)
+
+
+def iter_reports_batch(
+    reports: Iterable[Tuple[str, list]],
+    output_dir: str,
+    logo_path: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Gera um parecer (PDF) por aluno, gravando cada um direto no disco.
+
+    Os relatórios são distribuídos em um pool de processos quando o lote é
+    grande o suficiente; em cada processo o logo é decodificado uma única
+    vez e o cache de quebra de linhas é reaproveitado entre os relatórios.
+    Nenhum PDF fica acumulado em memória: só os caminhos voltam. Alunos
+    cujos nomes de arquivo coincidiriam recebem um sufixo
+    (ver unique_report_file_names).
+
+    Args:
+        reports: Pares (student_id, results), com `results` no formato de find_equivalencies.
+        output_dir (str): Pasta de saída (criada se não existir).
+        logo_path (str | None): Logo do cabeçalho.
+        max_workers (int | None): Número de processos. 1 força execução sequencial.
+
+    Yields:
+        str: O caminho de cada parecer, assim que é gravado (na ordem de entrada).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    reports = list(reports)
+    file_names = unique_report_file_names(student_id for student_id, _ in reports)
+    reports = [(file_name, results) for file_name, (_, results) in zip(file_names, reports)]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers <= 1 or len(reports) < REPORT_POOL_THRESHOLD:
+        for report in reports:
+            yield _write_student_report(report, output_dir, logo_path)
+        return
+
+    chunksize = max(1, len(reports) // (max_workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=MP_CONTEXT,
+        initializer=_init_report_worker,
+        initargs=(logo_path,)
+    ) as executor:
+        n = len(reports)
+        yield from executor.map(
+            _write_student_report, reports, [output_dir] * n, [logo_path] * n, chunksize=chunksize
+        )
+
+
+def write_combined_report(
+    reports: Iterable[Tuple[str, list]],
+    path: str,
+    logo_path: Optional[str] = None
+) -> str:
+    """
+    Gera UM PDF com uma seção por aluno (cada seção começa em uma nova
+    página, com o aluno no cabeçalho e um marcador no sumário do leitor).
+
+    Um único documento não pode ser dividido entre processos, então este
+    modo roda no processo atual; os alunos são consumidos um a um.
+
+    Returns:
+        str: O caminho gravado.
+    """
+    pdf = _new_report_pdf(logo_path)
+
+    for student_id, results in reports:
+        pdf.section_title = str(student_id)
+        pdf.add_page()
+        pdf.start_section(pdf.section_title)
+
+        found_results = [r for r in results if r.get("status") == "Encontrado"]
+        if not found_results:
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 10, NO_RESULTS_MESSAGE, 0, 1, "C")
+        for item in found_results:
+            pdf.print_table_row(item)
+
+    if pdf.page == 0:
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 10, NO_RESULTS_MESSAGE, 0, 1, "C")
+
+    return _write_atomic(pdf, path)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,170 @@
-import pdfplumber
 import re
+from functools import lru_cache
 from pprint import pprint
 
+from pdf_document import describe_pdf_source, open_pdf_document
+
+# Campos da página 1 do requerimento (compilados uma única vez, no import)
+REQUERIMENTO_FIELD_PATTERNS = {
+    "name": re.compile(r"NOME:\s*\n\s*([^\n]+)"),
+    "dre": re.compile(r"DRE:\s*\n\s*([^\n]+)"),
+    "email": re.compile(r"EMAIL:\s*([^\s]+)"),
+    "date": re.compile(r"DATA:\s*(\d{2}/\d{2}/\d{4})"),
+    "origin_institution": re.compile(r"INSTITUIÇÃO DE ENSINO SUPERIOR:\s*([^\n]+)")
+}
+
 def find_value(text, pattern):
     """
     Busca um valor no texto usando regex e retorna o grupo 1.
+    `pattern` pode ser uma string ou uma regex já compilada.
     """
-    match = re.search(pattern, text)
+    match = re.compile(pattern).search(text)
     if match:
         return match.group(1).strip()
     return None
 
-def parse_equivalencia_pdf(pdf_path):
+# Prefixos de departamento padrão das colunas da tabela
+UFRJ_PREFIXES = ("ICP", "MAE")
+ORIGIN_PREFIXES = ("MAT", "INF", "CTC")
+
+# Tipos de linha da tabela (classificação feita uma única vez por linha)
+LINE_EMPTY = 0     # linha vazia
+LINE_FRAGMENT = 1  # pedaço de código de origem que "vazou" para outra linha
+LINE_SIMPLE = 2    # linha principal com todas as colunas
+LINE_COMPLEX = 3   # linha principal sem o código de origem (está nas vizinhas)
+
+@lru_cache(maxsize=None)
+def _table_line_regexes(ufrj_prefixes, origin_prefixes):
+    """
+    Compila (uma vez por combinação de prefixos) as regex das linhas principais.
+    Dois ou mais espaços seguidos são o que divide as colunas.
+    """
+    ufrj = "|".join(map(re.escape, ufrj_prefixes))
+    origin = "|".join(map(re.escape, origin_prefixes))
+    simple_line_regex = re.compile(
+        rf'^((?:{ufrj})\d{{3}})\s+(.+?)\s{{2,}}((?:{origin})\d{{3,}})\s+(.+?)\s+(\d{{4}})$'
+    )
+    complex_line_regex = re.compile(
+        rf'^((?:{ufrj})\d{{3}})\s+(.+?)\s{{2,}}(.+?)\s+(\d{{4}})$'
+    )
+    return simple_line_regex, complex_line_regex
+
+def _classify_lines(lines, simple_line_regex, complex_line_regex):
+    """
+    Classifica cada linha UMA vez.
+
+    Returns:
+        tuple: (kinds, stripped, matches) - `kinds` é um bytearray com o tipo
+        de cada linha, `stripped` as linhas sem espaços nas pontas e `matches`
+        o match da regex de cada linha principal (None nas demais).
+    """
+    kinds = bytearray(len(lines))
+    stripped = [line.strip() for line in lines]
+    matches = [None] * len(lines)
+
+    for i, line in enumerate(stripped):
+        if not line:
+            continue  # LINE_EMPTY
+        match = simple_line_regex.match(line)
+        if match:
+            kinds[i] = LINE_SIMPLE
+        else:
+            match = complex_line_regex.match(line)
+            kinds[i] = LINE_COMPLEX if match else LINE_FRAGMENT
+        matches[i] = match
+
+    return kinds, stripped, matches
+
+def _parse_table_lines(data_lines, ufrj_prefixes=UFRJ_PREFIXES, origin_prefixes=ORIGIN_PREFIXES):
+    """
+    Reconstrói as linhas da tabela de disciplinas a partir das linhas de texto
+    (com layout) de UMA página, devolvendo cada disciplina assim que é montada.
+
+    Cada linha passa pelas regex uma única vez (`_classify_lines`); a montagem
+    das disciplinas só consulta o tipo já calculado das linhas vizinhas, então
+    o custo é linear no número de linhas.
+
+    Args:
+        data_lines (list[str]): Linhas de texto da página.
+        ufrj_prefixes (tuple[str, ...]): Prefixos dos códigos da UFRJ (1ª coluna).
+        origin_prefixes (tuple[str, ...]): Prefixos dos códigos da instituição de origem.
+    """
+    simple_line_regex, complex_line_regex = _table_line_regexes(tuple(ufrj_prefixes), tuple(origin_prefixes))
+    kinds, stripped, matches = _classify_lines(data_lines, simple_line_regex, complex_line_regex)
+    last = len(kinds) - 1
+
+    for i, kind in enumerate(kinds):
+        match = matches[i]
+
+        # CASO 1: Linha simples (Tudo nela)
+        if kind == LINE_SIMPLE:
+            yield {
+                "ufrj_discipline": {
+                    "code": match.group(1).strip(),
+                    "name": match.group(2).strip()
+                },
+                "origin_discipline": {
+                    "code": match.group(3).strip(),
+                    "name": match.group(4).strip()
+                }
+            }
+
+        # CASO 2: Linha complexa (Código nas linhas vizinhas, i-1 e i+1,
+        # quando elas são fragmentos e não linhas principais)
+        elif kind == LINE_COMPLEX:
+            origin_code_parts = []
+            if i > 0 and kinds[i-1] == LINE_FRAGMENT:
+                origin_code_parts.append(stripped[i-1])
+            if i < last and kinds[i+1] == LINE_FRAGMENT:
+                origin_code_parts.append(stripped[i+1])
+
+            yield {
+                "ufrj_discipline": {
+                    "code": match.group(1).strip(),
+                    "name": match.group(2).strip()
+                },
+                "origin_discipline": {
+                    "code": " ".join(origin_code_parts),
+                    "name": match.group(3).strip()
+                }
+            }
+
+def iter_disciplines(pdf_source, first_table_page=1, ufrj_prefixes=UFRJ_PREFIXES, origin_prefixes=ORIGIN_PREFIXES):
+    """
+    Percorre as páginas de tabela do requerimento e devolve as disciplinas
+    uma a uma (gerador), à medida que cada linha é reconstruída.
+
+    Só o texto de UMA página fica em memória por vez: o texto com layout não
+    é guardado no documento e o cache interno da página do pdfplumber é
+    liberado antes de passar para a próxima. Requerimentos cuja tabela
+    continua em várias páginas são lidos por completo.
+
+    Args:
+        pdf_source: Caminho, bytes, objeto de arquivo ou ParsedDocument já aberto.
+        first_table_page (int): Índice (0-based) da primeira página de tabela.
+        ufrj_prefixes (tuple[str, ...]): Prefixos dos códigos da UFRJ.
+        origin_prefixes (tuple[str, ...]): Prefixos dos códigos da instituição de origem.
+
+    Yields:
+        dict: {'ufrj_discipline': {...}, 'origin_discipline': {...}}
+    """
+    with open_pdf_document(pdf_source) as document:
+        for index in range(first_table_page, document.page_count):
+            page_text = document.page_layout_text(index, cache=False)
+            yield from _parse_table_lines(page_text.split('\n'), ufrj_prefixes, origin_prefixes)
+
+def read_equivalencia_pdf(pdf_path, ufrj_prefixes=UFRJ_PREFIXES, origin_prefixes=ORIGIN_PREFIXES):
     """
     Analisa o PDF de requerimento de equivalência e extrai os dados.
     Esta versão é robusta para PDFs "achatados" (não-formulário).
+
+    `pdf_path` pode ser um caminho, bytes, um objeto de arquivo ou um
+    ParsedDocument já aberto (compartilhado com outros extratores).
+    `ufrj_prefixes` e `origin_prefixes` são os prefixos de departamento
+    aceitos em cada coluna de código da tabela.
+
+    Diferente de `parse_equivalencia_pdf`, não trata erros: a exceção original
+    chega a quem chamou (usado pelo pipeline, que registra a causa real).
     """
     student_data = {
         "name": None,
@@ -25,107 +175,33 @@ def parse_equivalencia_pdf(pdf_path):
         "disciplines": []
     }
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            
-            # --- Página 1: Dados Pessoais  ---
-            if len(pdf.pages) > 0:
-                page_01 = pdf.pages[0]
-                text_01 = page_01.extract_text()
-
-                student_data['name'] = find_value(text_01, r"NOME:\s*\n\s*([^\n]+)")
-                student_data['dre'] = find_value(text_01, r"DRE:\s*\n\s*([^\n]+)")
-                student_data['email'] = find_value(text_01, r"EMAIL:\s*([^\s]+)")
-                student_data['date'] = find_value(text_01, r"DATA:\s*(\d{2}/\d{2}/\d{4})")
-                student_data['origin_institution'] = find_value(text_01, r"INSTITUIÇÃO DE ENSINO SUPERIOR:\s*([^\n]+)")
-
-            # --- Página 2: Tabela (Lógica Manual) ---
-            if len(pdf.pages) > 1:
-                page_02 = pdf.pages[1]
-                text_02 = page_02.extract_text(layout=True)
-                lines = text_02.split('\n')
-                
-                disciplines_list = []
-                data_lines = lines
-                
-                # Regex para as linhas principais da tabela
-                # \s{2,} (dois ou mais espaços) é o que divide as colunas
-                simple_line_regex = re.compile(
-                    r'^((?:ICP|MAE)\d{3})\s+(.+?)\s{2,}((?:MAT|INF|CTC)\d{3,})\s+(.+?)\s+(\d{4})$'
-                )
-                complex_line_regex = re.compile(
-                    r'^((?:ICP|MAE)\d{3})\s+(.+?)\s{2,}(.+?)\s+(\d{4})$'
-                )
-                
-                # --- [A LÓGICA FINAL] ---
-                # Em vez de loops 'while', iteramos linha por linha.
-                # Se uma linha é "principal", ela é responsável por
-                # verificar suas linhas vizinhas (i-1 e i+1).
-
-                # Usamos um 'set' para rastrear as linhas "fragmento"
-                # que já foram usadas por uma linha principal.
-                processed_fragments = set()
-
-                for i, line in enumerate(data_lines):
-                    line = line.strip()
-                    if not line or i in processed_fragments:
-                        continue
-
-                    # CASO 1: Linha simples (Tudo nela)
-                    simple_match = simple_line_regex.match(line)
-                    if simple_match:
-                        disciplines_list.append({
-                            "ufrj_discipline": {
-                                "code": simple_match.group(1).strip(),
-                                "name": simple_match.group(2).strip()
-                            },
-                            "origin_discipline": {
-                                "code": simple_match.group(3).strip(),
-                                "name": simple_match.group(4).strip()
-                            }
-                        })
-                        continue
-
-                    # CASO 2: Linha complexa (Código em outras linhas)
-                    complex_match = complex_line_regex.match(line)
-                    if complex_match:
-                        ufrj_code = complex_match.group(1).strip()
-                        ufrj_name = complex_match.group(2).strip()
-                        origin_name = complex_match.group(3).strip()
-                        origin_code_parts = []
-
-                        # Olha 1 linha para TRÁS
-                        if i > 0:
-                            prev_line = data_lines[i-1].strip()
-                            # Se a linha anterior não for vazia e não for uma linha principal
-                            if prev_line and not simple_line_regex.match(prev_line) and not complex_line_regex.match(prev_line):
-                                origin_code_parts.append(prev_line)
-                                processed_fragments.add(i-1)
-
-                        # Olha 1 linha para FRENTE
-                        if i + 1 < len(data_lines):
-                            next_line = data_lines[i+1].strip()
-                            # Se a linha seguinte não for vazia e não for uma linha principal
-                            if next_line and not simple_line_regex.match(next_line) and not complex_line_regex.match(next_line):
-                                origin_code_parts.append(next_line)
-                                processed_fragments.add(i+1)
-                        
-                        disciplines_list.append({
-                            "ufrj_discipline": {"code": ufrj_code, "name": ufrj_name},
-                            "origin_discipline": {
-                                "code": " ".join(origin_code_parts),
-                                "name": origin_name
-                            }
-                        })
-                        
-                student_data['disciplines'] = disciplines_list
+    with open_pdf_document(pdf_path) as document:
 
-    except Exception as e:
-        print(f"Erro ao processar o PDF {pdf_path}: {e}")
-        return None
+        # --- Página 1: Dados Pessoais  ---
+        if document.page_count > 0:
+            text_01 = document.page_text(0)
+
+            for key, pattern in REQUERIMENTO_FIELD_PATTERNS.items():
+                student_data[key] = find_value(text_01, pattern)
+
+        # --- Páginas 2 em diante: Tabela (Lógica Manual) ---
+        student_data['disciplines'] = list(
+            iter_disciplines(document, ufrj_prefixes=ufrj_prefixes, origin_prefixes=origin_prefixes)
+        )
 
     return student_data
 
+def parse_equivalencia_pdf(pdf_path, ufrj_prefixes=UFRJ_PREFIXES, origin_prefixes=ORIGIN_PREFIXES):
+    """
+    Igual a `read_equivalencia_pdf`, mas em caso de erro imprime a mensagem
+    e retorna None (comportamento usado pela interface).
+    """
+    try:
+        return read_equivalencia_pdf(pdf_path, ufrj_prefixes, origin_prefixes)
+    except Exception as e:
+        print(f"Erro ao processar o PDF {describe_pdf_source(pdf_path)}: {e}")
+        return None
+
 # --- Bloco de Execução Principal ---
 if __name__ == "__main__":
     file_name = "data/requerimento_equivalencias.pdf"
@@ -0,0 +1,471 @@
+"""
+Pipeline sem interface: requerimento (PDF) -> análise de equivalências -> parecer (PDF).
+
+Encadeia `read_equivalencia_pdf`, o motor de casamento (`find_equivalencies`)
+e o gerador de PDF em três estágios que rodam ao mesmo tempo, ligados por
+filas limitadas (produtor/consumidor): enquanto um requerimento é analisado, o
+próximo já está sendo extraído e o anterior sendo gravado. A extração (o
+estágio mais caro, limitado pela CPU) roda em um pool de processos. Pensado
+para a comissão apontar para uma pasta de entrada e receber os pareceres
+prontos (a estrutura de subpastas da entrada é mantida na saída).
+
+Uso:
+    python src/pipeline.py entrada/ -o pareceres/ --planilha "data/Equivalencias de Disciplinas.xlsx"
+    python src/pipeline.py "entrada/*.pdf" -o pareceres/ --planilha <url> --universidade PUC-Rio --workers 4
+"""
+# 1. Bibliotecas padrão (Standard Library)
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 2. Módulos da aplicação (Local application)
+from boa_batch import collect_pdf_paths
+from core import MATCHING_ENGINES, MP_CONTEXT, RuleIndex, compile_rule_indexes, find_equivalencies
+from data_loader import load_spreadsheet_cached
+from pdf_generator import create_pdf_bytes
+from pdf_parser import read_equivalencia_pdf
+from remote_workbook import RemoteWorkbook
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LOGO_PATH = os.path.join(PROJECT_ROOT, "assets", "logo_ic.png")
+
+# Tamanho padrão de cada fila entre estágios (limita a memória em pastas grandes)
+DEFAULT_QUEUE_SIZE = 8
+
+# Estágios do pipeline, na ordem (nome usado nos tempos de cada registro)
+STAGES = ("extracao", "analise", "relatorio")
+
+# Marca de fim de fluxo entre os estágios
+_DONE = object()
+
+
+# --- Etapas individuais ---
+
+def load_rule_indexes(source: str) -> Dict[str, RuleIndex]:
+    """
+    Carrega a planilha de regras (caminho local ou URL) e compila os índices.
+    """
+    if source.startswith(("http://", "https://")):
+        _, spreadsheet_data = RemoteWorkbook(source).fetch()
+    else:
+        with open(source, "rb") as f:
+            spreadsheet_data = load_spreadsheet_cached(f.read())
+        if spreadsheet_data is None:
+            raise ValueError(f"O arquivo '{source}' não pôde ser lido como uma planilha .xlsx.")
+
+    rule_indexes = compile_rule_indexes(spreadsheet_data)
+    if not rule_indexes:
+        raise ValueError("Nenhuma aba da planilha contém as colunas obrigatórias.")
+    return rule_indexes
+
+
+def resolve_university(name: Optional[str], universities: List[str]) -> Optional[str]:
+    """
+    Encontra a aba da universidade ignorando maiúsculas e espaços ("PUC - Rio" == "PUC-Rio").
+    """
+    if not name:
+        return None
+
+    def normalize(value: str) -> str:
+        return "".join(value.split()).casefold()
+
+    target = normalize(name)
+    return next((university for university in universities if normalize(university) == target), None)
+
+
+def requerimento_codes(student_data: Dict[str, Any]) -> str:
+    """
+    Junta os códigos de origem de todas as disciplinas do requerimento
+    (no formato aceito por `find_equivalencies`).
+    """
+    codes = [
+        discipline["origin_discipline"]["code"]
+        for discipline in student_data.get("disciplines", [])
+        if discipline["origin_discipline"]["code"]
+    ]
+    return " + ".join(codes)
+
+
+def input_root(pdf_paths: List[str]) -> str:
+    """
+    Pasta comum a todos os requerimentos (raiz da entrada).
+    """
+    if not pdf_paths:
+        return ""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in pdf_paths])
+
+
+def report_path(pdf_path: str, output_dir: str, root: Optional[str] = None) -> str:
+    """
+    Caminho do parecer gerado para um requerimento.
+
+    Com `root` (ver input_root), o caminho relativo do requerimento é mantido
+    na saída: "entrada/a/req.pdf" e "entrada/b/req.pdf" viram
+    "a/req_parecer.pdf" e "b/req_parecer.pdf", sem que um sobrescreva o outro.
+    Sem `root`, só o nome do arquivo é usado.
+    """
+    if root:
+        relative = os.path.relpath(os.path.abspath(pdf_path), root)
+    else:
+        relative = os.path.basename(pdf_path)
+    return os.path.join(output_dir, f"{os.path.splitext(relative)[0]}_parecer.pdf")
+
+
+def process_requerimento(
+    pdf_path: Any,
+    rule_indexes: Dict[str, RuleIndex],
+    university: Optional[str] = None,
+    engine: str = "greedy",
+    logo_path: Optional[str] = LOGO_PATH
+) -> Dict[str, Any]:
+    """
+    Processa UM requerimento de ponta a ponta, sem filas (uso programático).
+
+    Returns:
+        dict: Registro com 'status' ("ok", "pendente" ou "erro"), 'erro',
+              'universidade', 'resultados' e 'pdf' (bytes ou None).
+    """
+    record = _new_record(pdf_path)
+    steps = (_extract_step, _match_step(rule_indexes, university, engine), _render_step(logo_path))
+    for name, step in zip(STAGES, steps):
+        _apply_step(name, step, record)
+
+    return {
+        "status": record["status"],
+        "erro": record["erro"],
+        "universidade": record.get("universidade"),
+        "resultados": record.get("_results"),
+        "pdf": record.get("_pdf")
+    }
+
+
+def _new_record(pdf_path: Any) -> Dict[str, Any]:
+    return {"arquivo": pdf_path, "status": "ok", "erro": None, "tempos": {}}
+
+
+def _extract_step(record: Dict[str, Any]):
+    student_data = read_equivalencia_pdf(record["arquivo"])
+    if not student_data["disciplines"]:
+        raise ValueError("Nenhuma disciplina encontrada na tabela do requerimento.")
+
+    record["aluno"] = student_data["name"]
+    record["dre"] = student_data["dre"]
+    record["_student"] = student_data
+
+
+def _match_step(
+    rule_indexes: Dict[str, RuleIndex],
+    university: Optional[str],
+    engine: str
+) -> Callable[[Dict[str, Any]], None]:
+    universities = list(rule_indexes)
+
+    def step(record: Dict[str, Any]):
+        student_data = record["_student"]
+        name = university or student_data["origin_institution"]
+        selected = resolve_university(name, universities)
+        if selected is None:
+            raise ValueError(f"Universidade '{name}' não encontrada na planilha.")
+
+        results = find_equivalencies(rule_indexes, selected, requerimento_codes(student_data), engine=engine)
+        record["universidade"] = selected
+        record["_results"] = results
+
+        # Mesma regra do app: sem parecer enquanto houver disciplina não encontrada
+        not_found = [r["input_code"] for r in results if r.get("status") == "Não Encontrado na Planilha"]
+        if not_found:
+            record["status"] = "pendente"
+            record["erro"] = f"Disciplinas não encontradas na planilha: {', '.join(not_found)}"
+
+    return step
+
+
+def _render_step(logo_path: Optional[str]) -> Callable[[Dict[str, Any]], None]:
+    def step(record: Dict[str, Any]):
+        record["_pdf"] = create_pdf_bytes(record["_results"], logo_path)
+
+    return step
+
+
+def _write_step(output_dir: str, logo_path: Optional[str], root: Optional[str]) -> Callable[[Dict[str, Any]], None]:
+    render = _render_step(logo_path)
+
+    def step(record: Dict[str, Any]):
+        render(record)
+        path = report_path(record["arquivo"], output_dir, root)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(record.pop("_pdf"))
+        os.replace(temp_path, path)
+        record["saida"] = path
+
+    return step
+
+
+def _apply_step(name: str, step: Callable[[Dict[str, Any]], None], record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aplica `step` a um registro e anota o tempo gasto.
+    Registros que já falharam passam direto; exceções viram status "erro".
+    """
+    if record["status"] == "ok":
+        start = time.perf_counter()
+        try:
+            step(record)
+        except Exception as e:
+            record["status"] = "erro"
+            record["erro"] = str(e)
+        record["tempos"][name] = round(time.perf_counter() - start, 4)
+    return record
+
+
+# --- Pipeline em streaming ---
+
+def _run_stage(
+    name: str,
+    step: Callable[[Dict[str, Any]], None],
+    inbox: "queue.Queue",
+    outbox: "queue.Queue"
+):
+    """
+    Laço de um estágio: consome registros, aplica `step` e repassa adiante.
+    """
+    while True:
+        record = inbox.get()
+        if record is _DONE:
+            outbox.put(_DONE)
+            return
+        outbox.put(_apply_step(name, step, record))
+
+
+def _run_extraction(
+    executor: ProcessPoolExecutor,
+    pdf_paths: List[str],
+    outbox: "queue.Queue",
+    max_pending: int
+):
+    """
+    Estágio de extração: envia os requerimentos ao pool de processos e
+    repassa os registros na ordem de entrada.
+
+    No máximo `max_pending` extrações ficam em andamento; como `outbox` também
+    é limitada, um estágio seguinte lento segura o envio de novos arquivos.
+    """
+    pending = deque()
+
+    def forward():
+        path, future = pending.popleft()
+        try:
+            record = future.result()
+        except Exception as e:
+            # Falha do próprio pool (ex.: processo morto), não da extração
+            record = _new_record(path)
+            record["status"] = "erro"
+            record["erro"] = str(e)
+        outbox.put(record)
+
+    try:
+        for path in pdf_paths:
+            future = executor.submit(_apply_step, STAGES[0], _extract_step, _new_record(path))
+            pending.append((path, future))
+            if len(pending) >= max_pending:
+                forward()
+        while pending:
+            forward()
+    finally:
+        outbox.put(_DONE)
+
+
+def iter_pipeline(
+    pdf_paths: List[str],
+    rule_indexes: Dict[str, RuleIndex],
+    output_dir: str,
+    university: Optional[str] = None,
+    engine: str = "greedy",
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    logo_path: Optional[str] = LOGO_PATH,
+    workers: Optional[int] = None,
+    root: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Processa os requerimentos em três estágios concorrentes e devolve um
+    registro por arquivo assim que o seu parecer é gravado (na ordem de entrada).
+
+    A extração roda em um pool de `workers` processos (é o estágio limitado
+    pela CPU, que threads não paralelizam); análise e gravação rodam cada uma
+    em sua própria thread. As filas entre os estágios têm no máximo
+    `queue_size` itens: um estágio lento segura os anteriores em vez de
+    acumular documentos em memória.
+
+    Args:
+        pdf_paths (List[str]): Os requerimentos a processar.
+        rule_indexes (dict[str, RuleIndex]): Regras compiladas (ver load_rule_indexes).
+        output_dir (str): Pasta onde os pareceres são gravados.
+        university (str | None): Universidade de origem para todos os arquivos;
+                                 None usa a instituição informada em cada requerimento.
+        engine (str): Motor de casamento repassado a find_equivalencies.
+        queue_size (int): Capacidade de cada fila entre estágios.
+        logo_path (str | None): Logo do cabeçalho dos pareceres.
+        workers (int | None): Processos de extração (padrão: número de núcleos).
+        root (str | None): Raiz da entrada usada em report_path
+                           (padrão: a pasta comum a todos os `pdf_paths`).
+
+    Yields:
+        dict: 'arquivo', 'status' ("ok", "pendente" ou "erro"), 'erro', 'saida'
+              (caminho do parecer), 'aluno', 'dre', 'universidade' e 'tempos'
+              (segundos gastos em cada estágio).
+    """
+    if engine not in MATCHING_ENGINES:
+        raise ValueError(f"Motor de casamento desconhecido: '{engine}'. Opções: {', '.join(MATCHING_ENGINES)}")
+    os.makedirs(output_dir, exist_ok=True)
+    if root is None:
+        root = input_root(pdf_paths)
+
+    steps = (
+        _match_step(rule_indexes, university, engine),
+        _write_step(output_dir, logo_path, root)
+    )
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(steps) + 1)]
+    executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=MP_CONTEXT)
+    threads = [
+        threading.Thread(
+            target=_run_extraction,
+            args=(executor, pdf_paths, queues[0], queue_size),
+            name=f"pipeline-{STAGES[0]}",
+            daemon=True
+        )
+    ] + [
+        threading.Thread(
+            target=_run_stage,
+            args=(name, step, queues[i], queues[i + 1]),
+            name=f"pipeline-{name}",
+            daemon=True
+        )
+        for i, (name, step) in enumerate(zip(STAGES[1:], steps))
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            record = queues[-1].get()
+            if record is _DONE:
+                break
+            yield {key: value for key, value in record.items() if not key.startswith("_")}
+
+        for thread in threads:
+            thread.join()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_pipeline(
+    pdf_paths: List[str],
+    rule_indexes: Dict[str, RuleIndex],
+    output_dir: str,
+    university: Optional[str] = None,
+    engine: str = "greedy",
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    logo_path: Optional[str] = LOGO_PATH,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+    workers: Optional[int] = None,
+    root: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Executa `iter_pipeline` até o fim e resume o lote.
+
+    Returns:
+        dict: Contagens por status, vazão (docs/s) e, por estágio, o tempo
+              total e médio gasto. Como os estágios se sobrepõem, o tempo
+              total do lote fica abaixo da soma dos tempos dos estágios.
+    """
+    counts = {"ok": 0, "pendente": 0, "erro": 0}
+    stage_totals = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
+
+    records = iter_pipeline(
+        pdf_paths, rule_indexes, output_dir, university, engine, queue_size, logo_path, workers, root
+    )
+    for record in records:
+        counts[record["status"]] += 1
+        for name, seconds in record["tempos"].items():
+            stage_totals[name] += seconds
+        if on_record:
+            on_record(record)
+
+    elapsed = time.perf_counter() - start
+    processed = sum(counts.values())
+    return {
+        "processados": processed,
+        **counts,
+        "tempo_total_s": round(elapsed, 3),
+        "docs_por_s": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        "estagios": {
+            name: {
+                "total_s": round(total, 3),
+                "medio_s": round(total / processed, 4) if processed else 0.0
+            }
+            for name, total in stage_totals.items()
+        }
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera pareceres (PDF) a partir de requerimentos de equivalência.")
+    parser.add_argument("inputs", nargs="+", help="Pastas de entrada ou padrões glob com os requerimentos (PDF).")
+    parser.add_argument("-o", "--output", required=True, help="Pasta onde os pareceres são gravados.")
+    parser.add_argument("--planilha", required=True, help="Planilha de equivalências (.xlsx local ou URL).")
+    parser.add_argument("--universidade", default=None, help="Universidade de origem (padrão: a do requerimento).")
+    parser.add_argument("--motor", choices=sorted(MATCHING_ENGINES), default="greedy", help="Motor de casamento.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processos de extração (padrão: núcleos).")
+    parser.add_argument("--fila", type=int, default=DEFAULT_QUEUE_SIZE, help="Capacidade das filas entre estágios.")
+    parser.add_argument("--sobrescrever", action="store_true", help="Refaz pareceres que já existem na saída.")
+    args = parser.parse_args(argv)
+
+    pdf_paths = collect_pdf_paths(args.inputs)
+    # Raiz calculada sobre TODOS os arquivos, antes de pular os já processados
+    root = input_root(pdf_paths)
+    if not args.sobrescrever:
+        pdf_paths = [path for path in pdf_paths if not os.path.exists(report_path(path, args.output, root))]
+
+    if not pdf_paths:
+        print("Nenhum requerimento para processar.", file=sys.stderr)
+        return 0
+
+    try:
+        rule_indexes = load_rule_indexes(args.planilha)
+    except Exception as e:
+        print(f"❌ Erro ao carregar a planilha: {e}", file=sys.stderr)
+        return 1
+
+    def report(record: Dict[str, Any]):
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        if record["status"] != "ok":
+            print(f"⚠️ {record['arquivo']}: {record['erro']}", file=sys.stderr)
+
+    print(f"Processando {len(pdf_paths)} requerimento(s)...", file=sys.stderr)
+    summary = run_pipeline(
+        pdf_paths,
+        rule_indexes,
+        args.output,
+        university=args.universidade,
+        engine=args.motor,
+        queue_size=args.fila,
+        on_record=report,
+        workers=args.workers,
+        root=root
+    )
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+    return 1 if summary["erro"] or summary["pendente"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import hashlib
+import threading
+from typing import Callable, Optional
+
+import requests
+from pandas import DataFrame
+from requests.adapters import HTTPAdapter
+
+from data_loader import load_spreadsheet_cached
+
+
+def create_http_session(pool_maxsize: int = 4) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões (keep-alive reaproveitado entre buscas).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class RemoteWorkbook:
+    """
+    Planilha remota (.xlsx) revalidada com requisições HTTP condicionais.
+
+    Guarda o ETag/Last-Modified da última resposta e envia If-None-Match /
+    If-Modified-Since na busca seguinte. Em um 304 (Not Modified) os dados já
+    parseados são mantidos, sem baixar nem re-parsear o arquivo; assim é barato
+    revalidar com frequência e mudanças nas regras aparecem em segundos.
+
+    Servidores que não mandam validadores (ou ignoram If-None-Match) respondem
+    200 a toda busca; nesse caso o SHA-256 do conteúdo decide se houve mudança.
+
+    Atributos:
+        url (str): Endereço público da planilha.
+        data (dict[str, DataFrame] | None): Última versão parseada com sucesso.
+        etag (str | None): ETag da última resposta 200.
+        last_modified (str | None): Last-Modified da última resposta 200.
+        content_hash (str | None): SHA-256 do último conteúdo parseado com sucesso.
+        stats (dict): Contadores de buscas completas ('downloads') e de
+                      revalidações sem mudança ('not_modified').
+    """
+
+    def __init__(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = 30,
+        parser: Callable[[bytes], Optional[dict[str, DataFrame]]] = load_spreadsheet_cached
+    ):
+        """
+        Args:
+            url (str): Endereço público da planilha.
+            session (requests.Session | None): Sessão a reutilizar; por padrão
+                                               uma sessão com pool é criada.
+            timeout (float): Timeout de cada requisição, em segundos.
+            parser: Função que transforma os bytes do .xlsx no dicionário de abas.
+        """
+        self.url = url
+        self.session = session or create_http_session()
+        self.timeout = timeout
+        self.parser = parser
+
+        self.data: Optional[dict[str, DataFrame]] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.content_hash: Optional[str] = None
+        self.stats = {"downloads": 0, "not_modified": 0}
+
+        self._lock = threading.Lock()
+
+    def _conditional_headers(self) -> dict[str, str]:
+        if self.data is None:
+            return {}
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def fetch(self) -> tuple[bool, dict[str, DataFrame]]:
+        """
+        Revalida a planilha no servidor.
+
+        Returns:
+            tuple[bool, dict[str, DataFrame]]: (changed, data)
+            - changed é False quando o servidor respondeu 304 (ou 200 com o
+              mesmo conteúdo da última busca) e os dados anteriores foram mantidos.
+
+        Raises:
+            requests.RequestException: Falha de rede ou status HTTP de erro.
+            ValueError: O conteúdo baixado não pôde ser lido como planilha.
+        """
+        with self._lock:
+            response = self.session.get(
+                self.url,
+                headers=self._conditional_headers(),
+                timeout=self.timeout
+            )
+
+            if response.status_code == 304 and self.data is not None:
+                self.stats["not_modified"] += 1
+                return False, self.data
+
+            response.raise_for_status()
+            self.stats["downloads"] += 1
+
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if content_hash == self.content_hash and self.data is not None:
+                self.etag = response.headers.get("ETag")
+                self.last_modified = response.headers.get("Last-Modified")
+                return False, self.data
+
+            spreadsheet_data = self.parser(response.content)
+            if spreadsheet_data is None:
+                raise ValueError("O conteúdo baixado não pôde ser lido como uma planilha .xlsx.")
+
+            self.data = spreadsheet_data
+            self.content_hash = content_hash
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            return True, spreadsheet_data
@@ -0,0 +1,192 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from pandas import DataFrame
+
+from core import RuleIndex, compile_rule_indexes
+from data_loader import get_university_list
+from remote_workbook import RemoteWorkbook
+
+
+class RuleSnapshot:
+    """
+    Versão imutável das regras: os dados crus da planilha, os índices
+    compilados e os objetos derivados (lista de universidades), sempre
+    trocados juntos. Deve ser tratada como somente leitura.
+
+    `content_hash` identifica o conteúdo de origem (SHA-256 do .xlsx), para
+    que republicar a mesma planilha não gere uma nova versão.
+    """
+
+    __slots__ = ("version", "spreadsheet_data", "rule_indexes", "university_list", "loaded_at", "content_hash")
+
+    def __init__(
+        self,
+        version: int,
+        spreadsheet_data: dict[str, DataFrame],
+        rule_indexes: dict[str, RuleIndex],
+        content_hash: Optional[str] = None
+    ):
+        self.version = version
+        self.spreadsheet_data = spreadsheet_data
+        self.rule_indexes = rule_indexes
+        self.university_list = get_university_list(spreadsheet_data)
+        self.loaded_at = time.time()
+        self.content_hash = content_hash
+
+
+class RuleStore:
+    """
+    Repositório de regras único por processo, somente leitura e versionado.
+
+    Todas as sessões do Streamlit leem o mesmo snapshot; cada sessão guarda
+    apenas o número da versão que está usando. Quando uma nova versão é
+    publicada, todas as sessões passam a enxergá-la juntas e a memória não
+    cresce com o número de sessões simultâneas.
+    """
+
+    def __init__(self):
+        self._current: Optional[RuleSnapshot] = None
+        self._publish_lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[RuleSnapshot]:
+        """
+        O snapshot atual (ou None se nenhuma versão foi publicada ainda).
+        """
+        return self._current
+
+    @property
+    def version(self) -> int:
+        """
+        Número da versão atual (0 se nenhuma versão foi publicada ainda).
+        """
+        current = self._current
+        return current.version if current else 0
+
+    def is_current(self, spreadsheet_data: dict[str, DataFrame], content_hash: Optional[str] = None) -> bool:
+        """
+        True se esses dados (mesmo objeto ou mesmo hash de conteúdo) já são a versão atual.
+        """
+        current = self._current
+        if current is None:
+            return False
+        if content_hash is not None and content_hash == current.content_hash:
+            return True
+        return spreadsheet_data is current.spreadsheet_data
+
+    def publish(self, spreadsheet_data: dict[str, DataFrame], content_hash: Optional[str] = None) -> RuleSnapshot:
+        """
+        Compila e publica uma nova versão das regras.
+
+        A compilação acontece antes da troca; quem lê continua usando a
+        versão anterior até a atribuição final, que é atômica. Publicar os
+        dados da versão atual de novo não faz nada e devolve o snapshot atual,
+        para que as sessões não descartem resultados sem necessidade.
+        """
+        if self.is_current(spreadsheet_data, content_hash):
+            return self._current
+
+        rule_indexes = compile_rule_indexes(spreadsheet_data)
+        with self._publish_lock:
+            if self.is_current(spreadsheet_data, content_hash):
+                return self._current
+            snapshot = RuleSnapshot(self.version + 1, spreadsheet_data, rule_indexes, content_hash)
+            self._current = snapshot
+        return snapshot
+
+
+class RuleRefresher:
+    """
+    Recarrega e revalida a planilha de regras em uma thread de fundo.
+
+    Os usuários nunca esperam pela recarga: continuam lendo o snapshot atual
+    do RuleStore até que um novo esteja pronto (baixado, validado e
+    compilado), quando ele é publicado atomicamente. Uma recarga que falhe
+    na validação (ou na rede) nunca substitui dados bons; o erro fica
+    disponível em `last_error`.
+    """
+
+    def __init__(
+        self,
+        store: RuleStore,
+        workbook: RemoteWorkbook,
+        validator: Callable[[dict[str, DataFrame]], tuple[bool, str]],
+        interval: float = 30
+    ):
+        """
+        Args:
+            store (RuleStore): Onde as novas versões são publicadas.
+            workbook (RemoteWorkbook): Fonte revalidável da planilha.
+            validator: Função (dados) -> (is_valid, message), como validate_spreadsheet_data.
+            interval (float): Segundos entre revalidações.
+        """
+        self.store = store
+        self.workbook = workbook
+        self.validator = validator
+        self.interval = interval
+
+        self.last_error: Optional[str] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh_once(self) -> bool:
+        """
+        Revalida a planilha uma vez e publica um novo snapshot se ela mudou.
+
+        Returns:
+            bool: True se um novo snapshot foi publicado.
+        """
+        try:
+            changed, spreadsheet_data = self.workbook.fetch()
+            content_hash = self.workbook.content_hash
+            if not changed and self.store.current is not None:
+                return False
+            if self.store.is_current(spreadsheet_data, content_hash):
+                return False
+
+            is_valid, message = self.validator(spreadsheet_data)
+            if not is_valid:
+                self.last_error = message
+                return False
+
+            self.store.publish(spreadsheet_data, content_hash)
+            self.last_error = None
+            return True
+
+        except Exception as e:
+            self.last_error = (
+                f"Erro ao carregar a planilha da URL. Verifique o link no .env e se o "
+                f"arquivo é um .xlsx válido. (Erro: {e})"
+            )
+            return False
+
+        finally:
+            # Libera quem espera pela primeira carga, com sucesso ou com erro
+            self._ready.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "RuleRefresher":
+        """
+        Inicia a thread de fundo (idempotente).
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rule-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> Optional[RuleSnapshot]:
+        """
+        Bloqueia até a primeira tentativa de carga terminar e devolve o snapshot atual.
+        """
+        self._ready.wait(timeout)
+        return self.store.current
@@ -0,0 +1,10 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Os módulos da aplicação ficam em src/ e são importados sem prefixo de pacote
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+# Os benchmarks guardam as implementações antigas usadas como referência
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "benchmarks"))
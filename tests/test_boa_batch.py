@@ -0,0 +1,23 @@
+import json
+
+from boa_batch import _percentile, _RecordWriter
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    assert _percentile(values, 50) == 5
+    assert _percentile(values, 90) == 9
+    assert _percentile(values, 99) == 10
+    assert _percentile(list(range(1, 5)), 50) == 2
+    assert _percentile([], 50) == 0.0
+
+
+def test_record_writer_truncates_unless_appending(tmp_path):
+    output = str(tmp_path / "saida.jsonl")
+    for append in (False, False, True):
+        writer = _RecordWriter(output, append=append)
+        writer.write({"arquivo": "a.pdf", "status": "ok"})
+        writer.close()
+
+    with open(output, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == [{"arquivo": "a.pdf", "status": "ok"}] * 2
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from bench_boa_text import legacy_scan
+from classes.ufrj import scan_boa_text
+
+
+# Pedaços de linha escolhidos para provocar os casos difíceis: nota depois de
+# linha em branco, rótulos dentro de linhas de matéria, código sozinho na
+# linha, nome do aluno seguido de linha de matéria, espaços e tabs no fim.
+ADVERSARIAL_PIECES = [
+    "ABC123 Nome",
+    "",
+    "   ",
+    "9.0",
+    "  7.5  ",
+    "DEF456 Y 9.0",
+    "GHI789",
+    "ICP131 Programação 4.0 AP 8.5",
+    "ABC123 x CR acumulado: 6.5",
+    "CR acumulado: 8.1",
+    "MAC118 Cálculo Créditos obtidos acumulados: 12.0 AP 7.0",
+    "Créditos obtidos acumulados: 96.0",
+    "Data de Emissão",
+    "MARIA DA SILVA",
+    "ICPZ55 Atividades 0.0 1.0",
+    "abc123 minúsculo 1 2.0",
+    "FIM120\tFísica\t9.0\t",
+    "Prazo máximo de integralização: 12.0",
+    "Períodos Integralizados (RES 10/2004 - CEG): 5.0",
+    "Carga horária obtida acumulada: 2100.0",
+    "Carga horária acumulada extensão: 120.0",
+]
+
+
+@pytest.mark.parametrize("text, expected_courses", [
+    ("ABC123 Nome\n\n9.0\nDEF456 Y 9.0", ["ABC123", "DEF456"]),
+    ("ICP131 Prog 4.0 AP 8.5\nICPZ55 Atividades 0.0 1.0\n", ["ICP131"]),
+])
+def test_approved_courses_match_legacy(text, expected_courses):
+    assert scan_boa_text(text)["approved_courses"] == expected_courses
+    assert scan_boa_text(text) == legacy_scan(text)
+
+
+def test_field_inside_course_line_keeps_first_occurrence():
+    text = "ABC123 x CR acumulado: 6.5\nCR acumulado: 8.1\n"
+    assert scan_boa_text(text)["cr_acumulado"] == 6.5
+    assert scan_boa_text(text) == legacy_scan(text)
+
+
+def test_matches_legacy_on_adversarial_text():
+    rng = random.Random(2024)
+    for _ in range(5000):
+        lines = [rng.choice(ADVERSARIAL_PIECES) for _ in range(rng.randint(0, 14))]
+        text = "\n".join(lines) + rng.choice(["", "\n", "\n\n", " \n"])
+        assert scan_boa_text(text) == legacy_scan(text), repr(text)
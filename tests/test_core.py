@@ -0,0 +1,96 @@
+import itertools
+import random
+
+import pandas as pd
+
+from core import (
+    BATCH_POOL_THRESHOLD,
+    RuleIndex,
+    _match_optimal,
+    find_equivalencies,
+    find_equivalencies_batch
+)
+
+
+def _random_rule_index(rng, codes, max_rules=12):
+    origins = [
+        "+".join(rng.sample(codes, rng.randint(1, 3)))
+        for _ in range(rng.randint(1, max_rules))
+    ]
+    n = len(origins)
+    return RuleIndex(pd.DataFrame({
+        "Códigos Origem": origins,
+        "Nomes Origem": ["-"] * n,
+        "Equivalente?": ["Sim"] * n,
+        "Códigos UFRJ Destino": ["-"] * n,
+        "Nomes UFRJ Destino": ["-"] * n,
+        "Justificativa Parecer": ["-"] * n
+    }))
+
+
+def _best_cover(rule_index, candidates):
+    """
+    Força bruta: o maior número de códigos cobertos por regras disjuntas.
+    """
+    best = 0
+    for size in range(len(candidates) + 1):
+        for subset in itertools.combinations(candidates, size):
+            required = [rule_index.required[position] for position in subset]
+            covered = frozenset().union(*required)
+            if len(covered) == sum(map(len, required)):
+                best = max(best, len(covered))
+    return best
+
+
+def test_optimal_matches_brute_force():
+    rng = random.Random(7)
+    codes = [f"INF{i}" for i in range(8)]
+    for _ in range(300):
+        rule_index = _random_rule_index(rng, codes)
+        input_codes = frozenset(rng.sample(codes, rng.randint(1, len(codes))))
+        candidates = rule_index.candidates(input_codes)
+
+        chosen = _match_optimal(rule_index, candidates, input_codes, time_budget=10)
+
+        required = [rule_index.required[position] for position in chosen]
+        assert set(chosen) <= set(candidates)
+        assert len(frozenset().union(*required)) == sum(map(len, required))
+        assert sum(map(len, required)) == _best_cover(rule_index, candidates)
+
+
+def test_batch_matches_sequential_find_equivalencies():
+    rng = random.Random(11)
+    codes = [f"INF{i}" for i in range(10)]
+    all_data = {"UFRGS": _random_rule_index(rng, codes), "UFSC": _random_rule_index(rng, codes)}
+    universities = ["UFRGS", "UFSC", "DESCONHECIDA"]
+    requests = [
+        (f"aluno{i}", rng.choice(universities), " ".join(rng.sample(codes, rng.randint(1, 5))))
+        for i in range(BATCH_POOL_THRESHOLD + 16)
+    ]
+
+    batch = find_equivalencies_batch(all_data, requests, max_workers=2)
+
+    expected = pd.DataFrame([
+        {"student_id": student_id, "university": university, **result}
+        for student_id, university, codes_str in requests
+        for result in find_equivalencies(all_data, university, codes_str)
+    ])
+    assert "error" in expected.columns
+    pd.testing.assert_frame_equal(batch, expected)
+
+
+def test_bitset_backend_matches_index_backend():
+    rng = random.Random(3)
+    # Mais de 64 códigos: a matriz de bitmasks ocupa várias palavras de 64 bits
+    codes = [f"INF{i:03d}" for i in range(150)]
+    for _ in range(200):
+        rule_index = _random_rule_index(rng, codes, max_rules=80)
+        all_data = {"UFRGS": rule_index}
+        input_codes = rng.sample(codes, rng.randint(1, 40)) + ["FORA01"]
+        codes_str = " ".join(input_codes)
+
+        assert rule_index.candidates_bitset(frozenset(input_codes)) == rule_index.candidates(frozenset(input_codes))
+        assert (
+            find_equivalencies(all_data, "UFRGS", codes_str, backend="bitset")
+            == find_equivalencies(all_data, "UFRGS", codes_str, backend="index")
+        )
@@ -0,0 +1,49 @@
+import io
+
+import openpyxl
+import pandas as pd
+
+from data_loader import REQUIRED_COLUMNS, load_spreadsheet
+
+COLUMNS = sorted(REQUIRED_COLUMNS)
+
+
+def _xlsx(sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_required_only_detects_headers_like_read_excel():
+    sheets = {
+        "UFRGS": [COLUMNS + ["Extra"], ["-"] * len(COLUMNS) + ["x"]],
+        "UFSC": [[], COLUMNS, ["-"] * len(COLUMNS)],
+        "Notas": [["Qualquer coisa"]],
+    }
+    content = _xlsx(sheets)
+
+    full_data = pd.read_excel(io.BytesIO(content), sheet_name=None)
+    spreadsheet_data = load_spreadsheet(content, required_only=True)
+
+    assert set(spreadsheet_data) == {
+        sheet_name for sheet_name, df in full_data.items()
+        if REQUIRED_COLUMNS.issubset(df.columns)
+    }
+    assert set(spreadsheet_data["UFRGS"].columns) == REQUIRED_COLUMNS
+    assert len(spreadsheet_data["UFRGS"]) == 1
+
+
+def test_required_only_keeps_headers_when_no_sheet_is_valid():
+    partial = [column for column in COLUMNS if column != "Equivalente?"]
+    content = _xlsx({"UFRGS": [partial, ["-"] * len(partial)]})
+
+    spreadsheet_data = load_spreadsheet(content, required_only=True)
+
+    assert list(spreadsheet_data) == ["UFRGS"]
+    assert REQUIRED_COLUMNS - set(spreadsheet_data["UFRGS"].columns) == {"Equivalente?"}
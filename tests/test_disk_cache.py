@@ -0,0 +1,38 @@
+import os
+import time
+
+from disk_cache import read_entry, write_entry
+
+
+def _write_aged(tmp_path, names):
+    for age, name in enumerate(reversed(names)):
+        path = str(tmp_path / name)
+        write_entry(path, b"x" * 100)
+        stamp = time.time() - 100 + age
+        os.utime(path, (stamp, stamp))
+
+
+def test_write_entry_prunes_oldest_by_count(tmp_path):
+    _write_aged(tmp_path, ["novo.pkl", "meio.pkl", "velho.pkl"])
+
+    write_entry(str(tmp_path / "agora.pkl"), {"a": 1}, max_entries=2)
+
+    assert sorted(os.listdir(tmp_path)) == ["agora.pkl", "novo.pkl"]
+
+
+def test_write_entry_prunes_oldest_by_size(tmp_path):
+    _write_aged(tmp_path, ["novo.pkl", "meio.pkl", "velho.pkl"])
+    size = os.path.getsize(tmp_path / "novo.pkl")
+
+    write_entry(str(tmp_path / "agora.pkl"), b"x" * 100, max_bytes=3 * size)
+
+    assert sorted(os.listdir(tmp_path)) == ["agora.pkl", "meio.pkl", "novo.pkl"]
+
+
+def test_read_entry_drops_corrupt_file(tmp_path):
+    path = tmp_path / "quebrado.pkl"
+    path.write_bytes(b"nao e um pickle")
+
+    assert read_entry(str(path)) is None
+    assert not path.exists()
+    assert read_entry(str(tmp_path / "ausente.pkl")) is None
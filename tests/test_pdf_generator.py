@@ -0,0 +1,36 @@
+import os
+
+from pdf_generator import _new_report_pdf, iter_reports_batch, unique_report_file_names
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "logo_ic.png")
+
+
+def test_unique_report_file_names_adds_suffix_on_collision():
+    assert unique_report_file_names(["a/1", "a_1", "A_1", "b"]) == [
+        "a_1_parecer.pdf",
+        "a_1_2_parecer.pdf",
+        "A_1_3_parecer.pdf",
+        "b_parecer.pdf"
+    ]
+
+
+def test_iter_reports_batch_never_overwrites(tmp_path):
+    reports = [("a/1", []), ("a_1", []), ("a_1", [])]
+
+    paths = list(iter_reports_batch(reports, str(tmp_path), max_workers=1))
+
+    assert len(set(paths)) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths)
+
+
+def test_logo_is_embedded_once_for_all_pages():
+    pdf = _new_report_pdf(LOGO_PATH)
+    pdf.set_compression(False)
+    pdf.add_page()
+    pdf.add_page()
+    data = bytes(pdf.output())
+
+    # Uma imagem (mais a sua máscara de transparência), desenhada nas duas páginas
+    assert pdf.pages_count == 2
+    assert data.count(b"/Subtype /Image") - data.count(b"/SMask ") == 1
+    assert data.count(b"/I1 Do") == 2
@@ -0,0 +1,25 @@
+import os
+
+from pipeline import input_root, process_requerimento, report_path
+
+
+def test_report_path_keeps_subfolders_of_the_input():
+    paths = [os.path.join("entrada", "a", "req.pdf"), os.path.join("entrada", "b", "req.pdf")]
+    root = input_root(paths)
+
+    outputs = {report_path(path, "saida", root) for path in paths}
+
+    assert outputs == {
+        os.path.join("saida", "a", "req_parecer.pdf"),
+        os.path.join("saida", "b", "req_parecer.pdf")
+    }
+
+
+def test_process_requerimento_reports_extraction_errors(capsys):
+    record = process_requerimento(b"nao e um pdf", rule_indexes={})
+
+    assert record["status"] == "erro"
+    assert record["erro"]
+    assert record["pdf"] is None
+    # A causa vai no registro; nada é impresso na saída padrão
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from remote_workbook import RemoteWorkbook
+
+
+class _WorkbookServer:
+    """
+    Servidor HTTP local que faz o papel do link público da planilha.
+    """
+
+    def __init__(self):
+        self.body = b"v1"
+        self.etag = None
+        self.requests = []
+
+        server_state = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server_state.requests.append(dict(self.headers))
+                if server_state.etag and self.headers.get("If-None-Match") == server_state.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                if server_state.etag:
+                    self.send_header("ETag", server_state.etag)
+                self.send_header("Content-Length", str(len(server_state.body)))
+                self.end_headers()
+                self.wfile.write(server_state.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/planilha.xlsx"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = _WorkbookServer()
+    yield server
+    server.close()
+
+
+def _workbook(url):
+    parsed = []
+
+    def parser(content):
+        parsed.append(content)
+        return {"Aba": content}
+
+    return RemoteWorkbook(url, timeout=5, parser=parser), parsed
+
+
+def test_fetch_revalidates_with_etag(server):
+    server.etag = '"v1"'
+    workbook, parsed = _workbook(server.url)
+
+    assert workbook.fetch() == (True, {"Aba": b"v1"})
+    assert workbook.fetch() == (False, {"Aba": b"v1"})
+
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert workbook.stats == {"downloads": 1, "not_modified": 1}
+    assert parsed == [b"v1"]
+
+
+def test_fetch_without_validators_ignores_identical_content(server):
+    workbook, parsed = _workbook(server.url)
+
+    assert workbook.fetch() == (True, {"Aba": b"v1"})
+    assert workbook.fetch() == (False, {"Aba": b"v1"})
+    assert workbook.fetch() == (False, {"Aba": b"v1"})
+
+    assert parsed == [b"v1"]
+
+
+def test_fetch_reports_new_content(server):
+    workbook, parsed = _workbook(server.url)
+    workbook.fetch()
+
+    server.body = b"v2"
+    assert workbook.fetch() == (True, {"Aba": b"v2"})
+    assert parsed == [b"v1", b"v2"]
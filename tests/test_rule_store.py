@@ -0,0 +1,81 @@
+import pandas as pd
+
+from rule_store import RuleRefresher, RuleStore
+
+
+def _spreadsheet(origin):
+    return {"UFRGS": pd.DataFrame({
+        "Códigos Origem": [origin],
+        "Nomes Origem": ["-"],
+        "Equivalente?": ["Sim"],
+        "Códigos UFRJ Destino": ["-"],
+        "Nomes UFRJ Destino": ["-"],
+        "Justificativa Parecer": ["-"]
+    })}
+
+
+class _FakeWorkbook:
+    """
+    Faz o papel de RemoteWorkbook: devolve as respostas roteirizadas em sequência.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.content_hash = None
+
+    def fetch(self):
+        changed, data, self.content_hash = self.responses.pop(0)
+        return changed, data
+
+
+def _always_valid(spreadsheet_data):
+    return True, ""
+
+
+def test_publish_same_content_keeps_version():
+    store = RuleStore()
+    data = _spreadsheet("INF01")
+
+    first = store.publish(data, "h1")
+    assert store.publish(data, "h1") is first
+    assert store.publish(_spreadsheet("INF01"), "h1") is first
+    assert store.publish(data) is first
+    assert store.version == 1
+
+    assert store.publish(_spreadsheet("INF02"), "h2").version == 2
+
+
+def test_unchanged_fetch_does_not_publish():
+    data = _spreadsheet("INF01")
+    store = RuleStore()
+    refresher = RuleRefresher(store, _FakeWorkbook([
+        (True, data, "h1"),
+        (False, data, "h1"),
+        # Um 200 que o servidor considera novo, mas com o mesmo conteúdo
+        (True, _spreadsheet("INF01"), "h1"),
+    ]), _always_valid)
+
+    assert refresher.refresh_once() is True
+    assert refresher.refresh_once() is False
+    assert refresher.refresh_once() is False
+    assert store.version == 1
+
+
+def test_invalid_refresh_keeps_previous_snapshot():
+    def validator(spreadsheet_data):
+        if "INVALIDA" in spreadsheet_data:
+            return False, "faltam colunas"
+        return True, ""
+
+    store = RuleStore()
+    refresher = RuleRefresher(store, _FakeWorkbook([
+        (True, _spreadsheet("INF01"), "h1"),
+        (True, {"INVALIDA": pd.DataFrame()}, "h2"),
+    ]), validator)
+
+    assert refresher.refresh_once() is True
+    snapshot = store.current
+
+    assert refresher.refresh_once() is False
+    assert store.current is snapshot
+    assert refresher.last_error == "faltam colunas"